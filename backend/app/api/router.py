@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
 from app.api import routes_jobs, routes_results, routes_schedules, routes_templates
-from app.api.schemas import HealthResponse
+from app.api.schemas import HealthResponse, StatsResponse
+from app.core.events import event_bus
 from app.core.manager import manager
+from app.core.politeness import domain_limiter
 
 router = APIRouter()
 
@@ -31,3 +33,21 @@ async def health_check():
         jobs_running=manager.running_count,
         schedules_active=schedules_active or 0,
     )
+
+
+@router.get("/stats", response_model=StatsResponse, tags=["health"])
+async def stats():
+    """Runtime counters for tuning the scraping pipeline."""
+    from app.scraping.browser import browser_pool
+    from app.scraping.engine_selector import engine_selector
+
+    return StatsResponse(
+        jobs=manager.stats,
+        memory=manager.memory(),
+        queue=manager.queue.wait_stats(),
+        domains=domain_limiter.snapshot(),
+        events={**event_bus.stats, "subscribers": len(event_bus)},
+        pool=browser_pool.metrics(),
+        blocking=browser_pool.blocking_stats,
+        engines=engine_selector.snapshot(),
+    )
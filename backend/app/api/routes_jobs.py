@@ -1,52 +1,181 @@
+import asyncio
+import json
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.api.schemas import JobCreate, JobResponse, JobStatus
-from app.core.manager import manager
+from app.api.schemas import BatchCreate, BatchResponse, JobCreate, JobResponse, JobStatus
+from app.config import settings
+from app.core.events import event_bus
+from app.core.manager import JobRecord, manager
+from app.core.templates import template_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
+def _batch_response(batch: dict) -> BatchResponse:
+    return BatchResponse(
+        id=batch["id"],
+        template_id=batch["template_id"],
+        total=batch["total"],
+        created_at=batch["created_at"],
+        finished_at=batch["finished_at"],
+        **batch["counts"],
+    )
+
+
+def _local_time(value: datetime | None) -> datetime | None:
+    """Job times are naive local times; convert an aware timestamp to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _job_summary(job: JobRecord) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        template_id=job.template_id,
+        batch_id=job.batch_id,
+        url=job.url,
+        status=job.status,
+        priority=job.priority,
+        deadline=job.deadline,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
 @router.get("", response_model=list[JobResponse])
-async def list_jobs(status: JobStatus | None = None):
-    """List all jobs in memory."""
-    jobs = manager.list_jobs(status=status.value if status else None)
-    return [
-        JobResponse(
-            id=job["id"],
-            template_id=job["template_id"],
-            url=job["url"],
-            status=job["status"],
-            created_at=job["created_at"],
-            started_at=job.get("started_at"),
-            finished_at=job.get("finished_at"),
-        )
-        for job in jobs
-    ]
+async def list_jobs(
+    response: Response,
+    status: JobStatus | None = None,
+    batch_id: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: int | None = None,
+):
+    """
+    List jobs in memory, newest first.
+
+    When more jobs remain, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    jobs = manager.list_jobs(
+        status=status.value if status else None,
+        batch_id=batch_id,
+        limit=limit + 1,
+        cursor=cursor,
+    )
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        response.headers["X-Next-Cursor"] = str(jobs[-1].seq)
+    return [_job_summary(job) for job in jobs]
+
+
+@router.get("/events")
+async def job_events(
+    request: Request,
+    job_id: str | None = None,
+    batch_id: str | None = None,
+    template_id: int | None = None,
+    schedule_id: int | None = None,
+):
+    """
+    Stream job state transitions and batch progress (Server-Sent Events).
+
+    Filters combine: only events matching all of them are sent. A "lagged"
+    event means this client fell behind and events were dropped; re-read
+    the jobs it cares about.
+    """
+    subscription = event_bus.subscribe(
+        job_id=job_id,
+        batch_id=batch_id,
+        template_id=template_id,
+        schedule_id=schedule_id,
+    )
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.event_heartbeat_seconds
+                    )
+                except TimeoutError:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("", response_model=JobResponse, status_code=201)
 async def create_job(data: JobCreate):
     """Create a new job and enqueue it."""
-    from app.core.database import db
-
     # Validate template exists
-    template = await db.fetchrow("SELECT id FROM scrape_templates WHERE id = $1", data.template_id)
+    template = await template_cache.get(data.template_id)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
-    job = await manager.create_job(template_id=data.template_id, url=data.url)
+    job = await manager.create_job(
+        template_id=data.template_id,
+        url=data.url,
+        priority=data.priority.value,
+        deadline=_local_time(data.deadline),
+    )
 
-    return JobResponse(
-        id=job["id"],
-        template_id=job["template_id"],
-        url=job["url"],
-        status=job["status"],
-        created_at=job["created_at"],
+    return _job_summary(job)
+
+
+@router.post("/batch", response_model=BatchResponse, status_code=201)
+async def create_batch(data: BatchCreate):
+    """Create one job per URL for a template, validating the template once."""
+    template = await template_cache.get(data.template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+
+    batch = await manager.create_batch(
+        template_id=data.template_id,
+        urls=data.urls,
+        priority=data.priority.value,
+        deadline=_local_time(data.deadline),
     )
 
+    return _batch_response(batch)
+
+
+@router.get("/batch/{batch_id}", response_model=BatchResponse)
+async def get_batch(batch_id: str):
+    """Get aggregate progress of a batch."""
+    batch = manager.get_batch(batch_id)
+
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return _batch_response(batch)
+
+
+@router.delete("/batch/{batch_id}", response_model=BatchResponse)
+async def cancel_batch(batch_id: str):
+    """Cancel every job of a batch that hasn't finished yet."""
+    batch = manager.get_batch(batch_id)
+
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    manager.cancel_batch(batch_id)
+    return _batch_response(batch)
+
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(job_id: str):
@@ -57,11 +186,31 @@ async def get_job(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
 
     return JobResponse(
-        id=job["id"],
-        template_id=job["template_id"],
-        url=job["url"],
-        status=job["status"],
-        created_at=job["created_at"],
-        started_at=job.get("started_at"),
-        finished_at=job.get("finished_at"),
+        id=job.id,
+        template_id=job.template_id,
+        batch_id=job.batch_id,
+        url=job.url,
+        status=job.status,
+        priority=job.priority,
+        deadline=job.deadline,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        error_type=job.error_type,
+        attempts=job.attempts,
+        coalesced=job.coalesced,
+        readiness=job.readiness,
     )
+
+
+@router.delete("/{job_id}", status_code=204)
+async def cancel_job(job_id: str):
+    """Cancel a pending or running job."""
+    job = manager.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if not manager.cancel_job(job_id, reason="Cancelled by user"):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
@@ -66,6 +66,8 @@ async def list_results(
             status=row["status"],
             data=row["data"],
             error=row["error"],
+            error_type=row["error_type"],
+            attempt=row["attempt"],
             duration_ms=row["duration_ms"],
             extracted_at=row["extracted_at"],
         )
@@ -96,6 +98,8 @@ async def get_result(result_id: int):
         status=row["status"],
         data=row["data"],
         error=row["error"],
+        error_type=row["error_type"],
+        attempt=row["attempt"],
         duration_ms=row["duration_ms"],
         extracted_at=row["extracted_at"],
     )
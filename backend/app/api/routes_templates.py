@@ -12,6 +12,7 @@ from app.api.schemas import (
     TemplateUpdate,
 )
 from app.core.database import db
+from app.core.templates import template_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/templates", tags=["templates"])
@@ -155,6 +156,7 @@ async def update_template(template_id: int, data: TemplateUpdate):
     """
 
     row = await db.fetchrow(query, *values)
+    template_cache.invalidate(template_id)
 
     return TemplateResponse(
         id=row["id"],
@@ -172,6 +174,7 @@ async def update_template(template_id: int, data: TemplateUpdate):
 async def delete_template(template_id: int):
     """Delete template."""
     result = await db.execute("DELETE FROM scrape_templates WHERE id = $1", template_id)
+    template_cache.invalidate(template_id)
 
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Template not found")
@@ -190,11 +193,15 @@ async def test_template(template_id: int, data: TemplateTestRequest):
         result = await executor.execute(
             url=data.url,
             selectors=parse_jsonb(template["selectors"]) or [],
+            config=parse_jsonb(template["config"]) or {},
+            template_id=template_id,
+            url_pattern=template["url_pattern"],
         )
         return TemplateTestResponse(
             url=data.url,
             data=result["data"],
             duration_ms=result["duration_ms"],
+            readiness=result.get("readiness"),
         )
     except Exception as e:
         logger.error(f"Template test failed: {e}")
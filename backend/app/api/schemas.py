@@ -11,6 +11,13 @@ class JobStatus(str, Enum):
     RUNNING = "running"
     SUCCESS = "success"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobPriority(str, Enum):
+    INTERACTIVE = "interactive"
+    SCHEDULED = "scheduled"
+    BACKFILL = "backfill"
 
 
 class SelectorType(str, Enum):
@@ -26,6 +33,7 @@ class SelectorField(BaseModel):
     selector: str = Field(..., min_length=1)
     type: SelectorType = SelectorType.TEXT
     attribute: str | None = None  # Required if type=attribute
+    required: bool = False  # Page is ready only once this selector is present
 
 
 # Templates
@@ -63,6 +71,7 @@ class TemplateTestResponse(BaseModel):
     url: str
     data: dict[str, Any]
     duration_ms: int
+    readiness: dict[str, Any] | None = None
 
 
 # Schedules
@@ -101,16 +110,46 @@ class ScheduleResponse(BaseModel):
 class JobCreate(BaseModel):
     template_id: int
     url: str = Field(..., min_length=1)
+    priority: JobPriority = JobPriority.INTERACTIVE
+    deadline: datetime | None = None  # Dropped if still queued by then
 
 
 class JobResponse(BaseModel):
     id: str
     template_id: int
+    batch_id: str | None = None
     url: str
     status: JobStatus
+    priority: JobPriority = JobPriority.INTERACTIVE
+    deadline: datetime | None = None
     created_at: datetime
     started_at: datetime | None = None
     finished_at: datetime | None = None
+    error: str | None = None
+    error_type: str | None = None
+    attempts: int = 0
+    coalesced: int = 0
+    readiness: dict[str, Any] | None = None
+
+
+class BatchCreate(BaseModel):
+    template_id: int
+    urls: list[str] = Field(..., min_length=1, max_length=10000)
+    priority: JobPriority = JobPriority.BACKFILL
+    deadline: datetime | None = None
+
+
+class BatchResponse(BaseModel):
+    id: str
+    template_id: int
+    total: int
+    pending: int
+    running: int
+    success: int
+    failed: int
+    cancelled: int = 0
+    created_at: datetime
+    finished_at: datetime | None = None
 
 
 # Results
@@ -122,6 +161,8 @@ class ResultResponse(BaseModel):
     status: str
     data: dict[str, Any] | None
     error: str | None
+    error_type: str | None = None
+    attempt: int | None = None
     duration_ms: int | None
     extracted_at: datetime
 
@@ -140,3 +181,14 @@ class HealthResponse(BaseModel):
     jobs_pending: int
     jobs_running: int
     schedules_active: int
+
+
+class StatsResponse(BaseModel):
+    jobs: dict[str, int]
+    memory: dict[str, float | None]
+    queue: dict[str, dict[str, float]]
+    domains: dict[str, int]
+    events: dict[str, int]
+    pool: dict[str, int]
+    blocking: dict[str, dict[str, int]]
+    engines: list[dict[str, Any]]
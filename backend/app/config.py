@@ -9,14 +9,55 @@ class Settings(BaseSettings):
 
     # Browser
     browser_headless: bool = True
-    browser_pool_size: int = 3
+    browser_pool_size: int = 3  # Max contexts
+    browser_pool_min: int = 1  # Contexts kept open when idle
+    browser_pool_idle_seconds: int = 300  # Close extra contexts idle for this long
+    browser_lazy_start: bool = False  # Launch the browser on first use, not at startup
+    browser_processes: int = 1  # Chromium processes contexts are spread across
+    context_max_pages: int = 100  # Recycle a context after this many pages
+    context_max_age_seconds: int = 1800  # ...or once it is this old
+    context_max_heap_mb: int = 512  # ...or its renderer JS heap passes this (0 disables)
+    context_spares: int = 1  # Pre-created contexts that replace recycled ones
+    page_reuse: bool = True  # Keep one warm page per context between jobs
+    page_reset_clear_storage: bool = False  # Clear cookies/storage when resetting it
+    session_affinity: bool = True  # Route jobs to contexts holding their site's session
+    session_dir: str = "sessions"  # Where per-site storage state is persisted
+    session_save_seconds: int = 60  # Min interval between saves of a site's session
+    blocking_profile: str = "none"  # none, no-media, text-only, first-party-only
+
+    # Scraping
+    http_max_connections: int = 100  # Pooled connections for engine=http
+    http_timeout_seconds: float = 30.0
+    engine_reprobe_every: int = 50  # engine=auto: retry static after N browser jobs
+    engine_reprobe_seconds: int = 3600  # ...or after this long
+    extraction_mode: str = "batch"  # batch (single evaluate) or per_field
+    readiness_strategy: str = "selectors"  # selectors, mutation_quiet, network_idle, delay
+    readiness_timeout_ms: int = 10000
 
     # Application
     app_name: str = "Visual Builder Scraping"
     debug: bool = False
 
     # Workers
-    worker_count: int = 2
+    worker_count: int = 2  # Concurrent jobs (per worker process in supervisor mode)
+    worker_processes: int = 0  # Supervisor mode: run jobs in N processes (0 = in the API process)
+    queue_backend: str = "memory"  # memory (single node) or postgres (durable, multi-node)
+    queue_lease_seconds: int = 60  # postgres: lease renewed by heartbeats while a job runs
+    shutdown_grace_seconds: float = 30.0  # In-flight jobs get this long to finish on shutdown
+    job_timeout_seconds: float = 120.0  # Hard deadline per job (config.job_timeout_seconds)
+    template_cache_seconds: float = 5.0  # How long workers reuse a fetched template
+    coalesce_window_seconds: float = 300.0  # Duplicates join an in-flight job this recent (0 = off)
+    retry_max_attempts: int = 3  # Attempts per job, including the first (config.retry)
+    retry_backoff_seconds: float = 2.0  # Base of the exponential backoff, with full jitter
+    retry_max_backoff_seconds: float = 300.0
+    domain_rate_per_second: float = 2.0  # Job starts per second per target domain (0 = unlimited)
+    domain_burst: int = 5
+    domain_max_concurrency: int = 2  # Concurrent jobs per target domain (0 = unlimited)
+    job_retention_seconds: int = 86400  # Finished jobs are evicted from memory after this
+    job_retention_max: int = 50000  # ...or when more than this many finished jobs are held
+    job_retention_interval_seconds: int = 60
+    event_buffer_size: int = 256  # Events buffered per /jobs/events subscriber before dropping
+    event_heartbeat_seconds: float = 15.0  # Keep-alive comment on idle event streams
 
     # CORS - allow all origins for Chrome extension support
     cors_origins: list[str] = ["*"]
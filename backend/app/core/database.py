@@ -92,12 +92,40 @@ class Database:
                     extracted_at TIMESTAMP DEFAULT NOW()
                 );
 
+                ALTER TABLE scrape_results ADD COLUMN IF NOT EXISTS attempt INT DEFAULT 1;
+                ALTER TABLE scrape_results ADD COLUMN IF NOT EXISTS error_type VARCHAR(30);
+
+                -- Fila de jobs (QUEUE_BACKEND=postgres)
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id UUID PRIMARY KEY,
+                    template_id INT NOT NULL,
+                    schedule_id INT,
+                    batch_id UUID,
+                    url TEXT NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                    priority SMALLINT NOT NULL DEFAULT 0,
+                    deadline TIMESTAMP,
+                    attempts INT NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires_at TIMESTAMP,
+                    run_after TIMESTAMP,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT NOW(),
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                );
+
                 -- Índices
                 CREATE INDEX IF NOT EXISTS idx_results_template ON scrape_results(template_id);
                 CREATE INDEX IF NOT EXISTS idx_results_schedule ON scrape_results(schedule_id);
                 CREATE INDEX IF NOT EXISTS idx_results_extracted ON scrape_results(extracted_at DESC);
                 CREATE INDEX IF NOT EXISTS idx_schedules_enabled ON scrape_schedules(is_enabled);
                 CREATE INDEX IF NOT EXISTS idx_schedules_next_run ON scrape_schedules(next_run_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_pending ON scrape_jobs(priority, created_at)
+                    WHERE status = 'pending';
+                CREATE INDEX IF NOT EXISTS idx_jobs_lease ON scrape_jobs(lease_expires_at)
+                    WHERE status = 'running';
+                CREATE INDEX IF NOT EXISTS idx_jobs_batch ON scrape_jobs(batch_id);
             """)
             logger.info("Database tables created/verified")
 
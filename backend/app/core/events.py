@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Subscription filters, matched against the fields of the same name on events
+FILTER_KEYS = ("job_id", "batch_id", "template_id", "schedule_id")
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def job_event(job) -> dict[str, Any]:
+    """Event for a job state transition."""
+    return {
+        "type": "job",
+        "job_id": job.id,
+        "template_id": job.template_id,
+        "schedule_id": job.schedule_id,
+        "batch_id": job.batch_id,
+        "url": job.url,
+        "status": job.status,
+        "priority": job.priority,
+        "attempts": job.attempts,
+        "error": job.error,
+        "error_type": job.error_type,
+        "created_at": _iso(job.created_at),
+        "started_at": _iso(job.started_at),
+        "finished_at": _iso(job.finished_at),
+    }
+
+
+def batch_event(batch: dict) -> dict[str, Any]:
+    """Event for a change in a batch's progress."""
+    return {
+        "type": "batch",
+        "batch_id": batch["id"],
+        "template_id": batch["template_id"],
+        "total": batch["total"],
+        **batch["counts"],
+        "finished_at": _iso(batch["finished_at"]),
+    }
+
+
+class Subscription:
+    """A subscriber's filters and its bounded event buffer."""
+
+    __slots__ = ("filters", "queue", "dropped")
+
+    def __init__(self, filters: dict[str, Any], buffer_size: int):
+        self.filters = filters
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        return all(event.get(key) == value for key, value in self.filters.items())
+
+    def overflow(self, event: dict[str, Any]):
+        """
+        Buffer full: drop everything buffered along with event, so the
+        subscriber reloads and then only gets events newer than the drop.
+        """
+        self.dropped += self.queue.qsize() + 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def get(self) -> dict[str, Any]:
+        """
+        Next event. After events were dropped, a "lagged" event comes first
+        so the subscriber knows to re-read the current state.
+        """
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "lagged", "dropped": dropped}
+        return await self.queue.get()
+
+
+class EventBus:
+    """
+    Fans job and batch events out to subscribers (the SSE endpoint).
+
+    Publishing never blocks: a subscriber whose buffer is full loses its
+    buffered events instead of slowing the manager down, and is told so.
+    """
+
+    def __init__(self):
+        self._subscribers: set[Subscription] = set()
+        self.stats = {"published": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, **filters) -> Subscription:
+        """Subscribe to events matching every given filter (see FILTER_KEYS)."""
+        unknown = set(filters) - set(FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown event filters: {', '.join(sorted(unknown))}")
+        subscription = Subscription(
+            {key: value for key, value in filters.items() if value is not None},
+            settings.event_buffer_size,
+        )
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: dict[str, Any]):
+        if not self._subscribers:
+            return
+        self.stats["published"] += 1
+        for subscription in self._subscribers:
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                dropped = subscription.dropped
+                subscription.overflow(event)
+                self.stats["dropped"] += subscription.dropped - dropped
+
+
+# Global event bus instance
+event_bus = EventBus()
@@ -1,20 +1,691 @@
 import asyncio
+import bisect
+import functools
+import heapq
+import itertools
+import json
 import logging
+import os
+import socket
+import time
 import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any
+from urllib.parse import urlparse
+
+import asyncpg
+
+from app.config import settings
+from app.core.database import db
+from app.core.events import batch_event, event_bus, job_event
+from app.core.politeness import domain_limiter
+from app.core.templates import template_cache
+from app.core.timers import TimerWheel
 
 logger = logging.getLogger(__name__)
 
+NOTIFY_CHANNEL = "scrape_jobs"
+STATUS_CHANNEL = "scrape_job_status"  # status transitions, mirrored by the other nodes
+
+JOB_STATUSES = ("pending", "running", "success", "failed", "cancelled")
+FINISHED_STATUSES = ("success", "failed", "cancelled")
+PRIORITIES = ("interactive", "scheduled", "backfill")  # Served strictly in this order
+
+
+def _rss_mb() -> float | None:
+    """Resident memory of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024, 1)
+
+
+class JobRecord:
+    """An in-memory job. Slotted: hundreds of thousands may be held at once."""
+
+    __slots__ = (
+        "seq",
+        "id",
+        "template_id",
+        "schedule_id",
+        "batch_id",
+        "url",
+        "status",
+        "priority",
+        "deadline",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "result",
+        "error",
+        "error_type",
+        "readiness",
+        "attempts",
+        "coalesced",
+    )
+
+    def __init__(
+        self,
+        seq: int,
+        id: str,
+        template_id: int,
+        url: str,
+        schedule_id: int | None = None,
+        batch_id: str | None = None,
+        priority: str = "interactive",
+        deadline: datetime | None = None,
+        created_at: datetime | None = None,
+    ):
+        self.seq = seq
+        self.id = id
+        self.template_id = template_id
+        self.schedule_id = schedule_id
+        self.batch_id = batch_id
+        self.url = url
+        self.status = "pending"
+        self.priority = priority
+        self.deadline = deadline  # Dropped unstarted after this
+        self.created_at = created_at or datetime.now()
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.result: Any = None
+        self.error: str | None = None
+        self.error_type: str | None = None
+        self.readiness: dict[str, Any] | None = None
+        self.attempts = 0
+        self.coalesced = 0
+
+
+class QueueBackend(ABC):
+    """Where pending jobs wait until a worker claims them."""
+
+    def __init__(self, manager: "WorkerManager"):
+        self.manager = manager
+        self._waits = {p: {"count": 0, "total_ms": 0, "max_ms": 0} for p in PRIORITIES}
+
+    async def start(self):
+        """Prepare the backend (connections, background tasks)."""
+
+    async def stop(self):
+        """Release resources held by the backend."""
+
+    @abstractmethod
+    async def put(self, job: JobRecord):
+        """Enqueue a job."""
+
+    async def put_many(self, jobs: list[JobRecord]):
+        """Enqueue many jobs."""
+        for job in jobs:
+            await self.put(job)
+
+    @abstractmethod
+    async def get(self) -> str | None:
+        """Wait for and claim the next job. Returns its ID, or None once the queue is closed."""
+
+    @abstractmethod
+    def close(self):
+        """Stop handing out jobs: blocked and later get() calls return None."""
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """Approximate number of pending jobs."""
+
+    @abstractmethod
+    def requeue(self, job: JobRecord, delay: float = 0.0, counted: bool = True):
+        """
+        Hand a dequeued job back, claimable again after delay seconds.
+
+        counted=False (the job never started, e.g. deferred by politeness)
+        takes back the attempt its dequeue counted.
+        """
+
+    def job_updated(self, job: JobRecord, old_status: str):
+        """Called after every job update."""
+
+    def cancel(self, job: JobRecord):
+        """A job was cancelled. Queued entries are skipped when dequeued."""
+
+    def runs_elsewhere(self, job: JobRecord) -> bool:
+        """Whether the job is running on another node, which alone can cancel it."""
+        return False
+
+    def request_cancel(self, job: JobRecord, reason: str, error_type: str):
+        """Ask the node running the job to cancel it."""
+        raise NotImplementedError
+
+    def _record_wait(self, job: JobRecord, wait_seconds: float):
+        """Record how long a job waited since it was last enqueued (or became due)."""
+        wait_ms = int(wait_seconds * 1000)
+        waits = self._waits[job.priority]
+        waits["count"] += 1
+        waits["total_ms"] += wait_ms
+        waits["max_ms"] = max(waits["max_ms"], wait_ms)
+
+    def wait_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Queue wait per priority class: from the last (re)enqueue, or the end of
+        a retry backoff, to dequeue. Earlier attempts don't count.
+        """
+        return {
+            priority: {
+                "count": w["count"],
+                "avg_ms": round(w["total_ms"] / w["count"], 1) if w["count"] else 0,
+                "max_ms": w["max_ms"],
+            }
+            for priority, w in self._waits.items()
+        }
+
+
+class MemoryQueue(QueueBackend):
+    """
+    In-process queue for single-node deployments. Pending jobs are lost on restart.
+
+    Priority classes are served strictly in order. Within a class, flows of
+    (template, domain) share the workers by start-time fair queuing: a job is
+    tagged max(virtual time, its flow's last tag) + 1/weight and the smallest
+    tag goes first, so a schedule enqueueing thousands of jobs can't starve
+    other templates. Weight comes from the template's config.weight.
+    """
+
+    def __init__(self, manager: "WorkerManager"):
+        super().__init__(manager)
+        # Entries: (tag, seq, job id, flow, enqueue time)
+        self._heaps: dict[str, list[tuple[float, int, str, tuple, float]]] = {
+            p: [] for p in PRIORITIES
+        }
+        self._vtime = {p: 0.0 for p in PRIORITIES}
+        self._flow_tags: dict[tuple, float] = {}
+        self._items = asyncio.Semaphore(0)
+        self._size = 0
+        self._queued: set[str] = set()  # job ids in the heaps
+        self._cancelled: set[str] = set()  # ...of which cancelled, skipped by workers
+        self._timers = TimerWheel()
+        self._puts: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def start(self):
+        if self._closed:
+            self._closed = False
+            self._items = asyncio.Semaphore(self._size)
+        self._timers.start()
+
+    async def stop(self):
+        self._timers.stop()
+
+    async def put(self, job: JobRecord):
+        await self.put_many([job])
+
+    async def put_many(self, jobs: list[JobRecord]):
+        weights: dict[int, float] = {}
+        for job in jobs:
+            if job.template_id not in weights:
+                weights[job.template_id] = await self._weight(job.template_id)
+            self._push(job, weights[job.template_id])
+
+    async def _weight(self, template_id: int) -> float:
+        template = await template_cache.get(template_id)
+        config = (template["config"] or {}) if template else {}
+        return max(float(config.get("weight", 1)), 0.01)
+
+    def _push(self, job: JobRecord, weight: float):
+        if job.status == "cancelled":
+            # Cancelled while waiting on a timer or a domain slot
+            return
+        flow = (job.priority, job.template_id, urlparse(job.url).hostname)
+        tag = max(self._vtime[job.priority], self._flow_tags.get(flow, 0.0)) + 1.0 / weight
+        self._flow_tags[flow] = tag
+        heapq.heappush(self._heaps[job.priority], (tag, job.seq, job.id, flow, time.monotonic()))
+        self._queued.add(job.id)
+        self._size += 1
+        self._items.release()
+
+    async def get(self) -> str | None:
+        await self._items.acquire()
+        if self._closed:
+            # Pass the wakeup on to the next blocked worker
+            self._items.release()
+            return None
+
+        for priority in PRIORITIES:
+            heap = self._heaps[priority]
+            if heap:
+                break
+        tag, _, job_id, flow, enqueued = heapq.heappop(heap)
+        self._vtime[priority] = tag
+        self._size -= 1
+        self._queued.discard(job_id)
+        self._cancelled.discard(job_id)
+
+        # The flow's last job: a new one would be tagged from vtime anyway
+        if self._flow_tags.get(flow) == tag:
+            del self._flow_tags[flow]
+
+        job = self.manager.get_job(job_id)
+        if job:
+            job.attempts += 1
+            self._record_wait(job, time.monotonic() - enqueued)
+        return job_id
+
+    def qsize(self) -> int:
+        return self._size - len(self._cancelled) + len(self._timers)
+
+    def cancel(self, job: JobRecord):
+        if job.id in self._queued:
+            self._cancelled.add(job.id)
+
+    def close(self):
+        self._closed = True
+        self._items.release()
+
+    def requeue(self, job: JobRecord, delay: float = 0.0, counted: bool = True):
+        if not counted:
+            job.attempts -= 1
+        if delay > 0:
+            self._timers.schedule(delay, lambda: self._put_soon(job))
+        else:
+            self._put_soon(job)
+
+    def _put_soon(self, job: JobRecord):
+        task = asyncio.create_task(self.put(job))
+        self._puts.add(task)
+        task.add_done_callback(self._puts.discard)
+
+
+class PostgresQueue(QueueBackend):
+    """
+    Durable queue on the scrape_jobs table, shared by any number of nodes.
+
+    Jobs are claimed with FOR UPDATE SKIP LOCKED and leased to this node.
+    Leases are renewed by a heartbeat while jobs run; leases left to expire
+    (crashed node) are reclaimed back to pending. Idle workers sleep until a
+    NOTIFY on the scrape_jobs channel. Every status change a node writes is
+    also announced on scrape_job_status, so the node that created a job
+    (GET /jobs/{id}, batch progress) follows it wherever it runs.
+    """
+
+    def __init__(self, manager: "WorkerManager"):
+        super().__init__(manager)
+        self.node_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._listener: asyncpg.Connection | None = None
+        self._wakeup = asyncio.Event()
+        self._leased: set[str] = set()
+        self._writes: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._requests: set[asyncio.Task] = set()  # cancel requests being sent
+        self._pending = 0
+        self._empty = False  # last claim found nothing: wait for a NOTIFY first
+        self._closed = False
+
+    async def start(self):
+        self._closed = False
+        self._listener = await asyncpg.connect(settings.database_url)
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        await self._listener.add_listener(STATUS_CHANNEL, self._on_status)
+        self._tasks = [
+            asyncio.create_task(self._lease_loop()),
+            asyncio.create_task(self._write_loop()),
+        ]
+        self._pending = await db.fetchval(
+            "SELECT COUNT(*) FROM scrape_jobs WHERE status = 'pending'"
+        )
+        logger.info(f"Postgres queue started as {self.node_id}")
+
+    async def stop(self):
+        # Flush pending status writes, then hand unfinished leases back
+        await self._writes.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+        await db.execute(
+            """
+            UPDATE scrape_jobs
+            SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL,
+                started_at = NULL, run_after = NOW()
+            WHERE lease_owner = $1 AND status = 'running'
+            """,
+            self.node_id,
+        )
+        await db.execute("SELECT pg_notify($1, '')", NOTIFY_CHANNEL)
+        self._leased.clear()
+
+        if self._listener:
+            await self._listener.close()
+            self._listener = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._wakeup.set()
+
+    def _on_status(self, connection, pid, channel, payload):
+        """Mirror a status change made by another node onto our copy of the job."""
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            return
+        job = self.manager.get_job(change["id"])
+        if "cancel" in change:
+            # Cancel request for a job running here
+            if job is not None and job.id in self._leased:
+                self.manager.cancel_job(job.id, change["cancel"], change["error_type"])
+            return
+        if change["node"] == self.node_id or job is None or job.id in self._leased:
+            return
+        status = change["status"]
+        if status == job.status or job.status in FINISHED_STATUSES:
+            return
+
+        fields = {"status": status, "error": change["error"], "error_type": change["error_type"]}
+        if status == "running":
+            fields["started_at"] = datetime.now()
+        elif status in FINISHED_STATUSES:
+            fields["finished_at"] = datetime.now()
+        self.manager.update_job(job.id, **fields)
+
+    async def _announce(self, job_id: str, status: str, error: str | None):
+        job = self.manager.get_job(job_id)
+        payload = {
+            "id": job_id,
+            "node": self.node_id,
+            "status": status,
+            # NOTIFY payloads are limited to 8000 bytes
+            "error": error[:1000] if error else None,
+            "error_type": job.error_type if job else None,
+        }
+        await db.execute("SELECT pg_notify($1, $2)", STATUS_CHANNEL, json.dumps(payload))
+
+    async def _request_cancel(self, job_id: str, reason: str, error_type: str):
+        """Announce a cancel request; the node holding the job's lease acts on it."""
+        payload = {
+            "id": job_id,
+            "node": self.node_id,
+            "cancel": reason[:1000],
+            "error_type": error_type,
+        }
+        try:
+            await db.execute("SELECT pg_notify($1, $2)", STATUS_CHANNEL, json.dumps(payload))
+        except Exception as e:
+            logger.error(f"Failed to request the cancel of job {job_id}: {e}")
+
+    async def put(self, job: JobRecord):
+        await self.put_many([job])
+
+    async def put_many(self, jobs: list[JobRecord]):
+        async with db.transaction() as conn:
+            await conn.copy_records_to_table(
+                "scrape_jobs",
+                records=[
+                    (
+                        uuid.UUID(job.id),
+                        job.template_id,
+                        job.schedule_id,
+                        uuid.UUID(job.batch_id) if job.batch_id else None,
+                        job.url,
+                        PRIORITIES.index(job.priority),
+                        job.deadline,
+                    )
+                    for job in jobs
+                ],
+                columns=[
+                    "id",
+                    "template_id",
+                    "schedule_id",
+                    "batch_id",
+                    "url",
+                    "priority",
+                    "deadline",
+                ],
+            )
+            await conn.execute("SELECT pg_notify($1, '')", NOTIFY_CHANNEL)
+        self._pending += len(jobs)
+
+    async def get(self) -> str | None:
+        while not self._closed:
+            if self._empty:
+                try:
+                    # Timeout is only a safety net for missed notifications
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=settings.queue_lease_seconds
+                    )
+                except TimeoutError:
+                    pass
+                if self._closed:
+                    break
+
+            # Clear before claiming so a NOTIFY arriving meanwhile isn't lost
+            self._wakeup.clear()
+            claim = asyncio.ensure_future(self._claim())
+            try:
+                row = await asyncio.shield(claim)
+            except asyncio.CancelledError:
+                # The worker was cancelled; don't strand a row we may have leased
+                claim.add_done_callback(self._release_orphan)
+                raise
+            if row:
+                self._empty = False
+                return self._adopt(row)
+            self._empty = True
+        return None
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+
+    async def _claim(self):
+        return await db.fetchrow(
+            """
+            UPDATE scrape_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                started_at = NOW(),
+                lease_owner = $1,
+                lease_expires_at = NOW() + make_interval(secs => $2)
+            WHERE id = (
+                SELECT id FROM scrape_jobs
+                WHERE status = 'pending' AND (run_after IS NULL OR run_after <= NOW())
+                ORDER BY priority, created_at
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING *,
+                -- Due since creation, or since its last requeue (each one sets run_after)
+                EXTRACT(EPOCH FROM NOW() - COALESCE(run_after, created_at)) AS waited_seconds
+            """,
+            self.node_id,
+            float(settings.queue_lease_seconds),
+        )
+
+    def _release_orphan(self, claim: asyncio.Future):
+        if claim.cancelled() or claim.exception() or not claim.result():
+            return
+        self._writes.put_nowait((str(claim.result()["id"]), "deferred", None, 0.0))
+
+    def _adopt(self, row) -> str:
+        """Load a claimed row into the manager's job table."""
+        job_id = str(row["id"])
+        job = self.manager.get_job(job_id)
+        if job is None:
+            job = self.manager._add_job(
+                job_id,
+                row["template_id"],
+                row["url"],
+                schedule_id=row["schedule_id"],
+                batch_id=str(row["batch_id"]) if row["batch_id"] else None,
+                priority=PRIORITIES[row["priority"]],
+                deadline=row["deadline"],
+                created_at=row["created_at"],
+            )
+        job.attempts = row["attempts"]
+        self._record_wait(job, max(0.0, float(row["waited_seconds"])))
+        self._leased.add(job_id)
+        self._writes.put_nowait((job_id, "running", None, 0.0))
+        self._pending = max(0, self._pending - 1)
+        return job_id
+
+    def qsize(self) -> int:
+        return self._pending
+
+    def requeue(self, job: JobRecord, delay: float = 0.0, counted: bool = True):
+        if job.id in self._leased:
+            self._leased.discard(job.id)
+            self._pending += 1
+            status = "pending" if counted else "deferred"
+            self._writes.put_nowait((job.id, status, job.error, delay))
+
+    def cancel(self, job: JobRecord):
+        # Not leased by this node: cancel the row if it's still pending (a job
+        # another node already claimed finishes there)
+        if job.id not in self._leased:
+            self._writes.put_nowait((job.id, "cancelled", job.error, 0.0))
+
+    def runs_elsewhere(self, job: JobRecord) -> bool:
+        return job.status == "running" and job.id not in self._leased
+
+    def request_cancel(self, job: JobRecord, reason: str, error_type: str):
+        task = asyncio.create_task(self._request_cancel(job.id, reason, error_type))
+        self._requests.add(task)
+        task.add_done_callback(self._requests.discard)
+
+    def job_updated(self, job: JobRecord, old_status: str):
+        status = job.status
+        if status == old_status or job.id not in self._leased:
+            return
+        if status in FINISHED_STATUSES:
+            self._leased.discard(job.id)
+            self._writes.put_nowait((job.id, status, job.error, 0.0))
+
+    async def _write_loop(self):
+        """Persist status transitions in order, off the workers' path."""
+        while True:
+            job_id, status, error, delay = await self._writes.get()
+            try:
+                if status == "running":
+                    # Already written by the claim, only announced
+                    pass
+                elif status in ("pending", "deferred"):
+                    # A deferred job never started: give back the attempt its claim counted
+                    await db.execute(
+                        """
+                        UPDATE scrape_jobs
+                        SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL,
+                            started_at = NULL, run_after = NOW() + make_interval(secs => $2),
+                            error = $3, attempts = attempts - $4
+                        WHERE id = $1
+                        """,
+                        uuid.UUID(job_id),
+                        float(delay),
+                        error,
+                        1 if status == "deferred" else 0,
+                    )
+                    if delay:
+                        # Other nodes pick it up on their safety poll
+                        asyncio.get_running_loop().call_later(delay, self._wakeup.set)
+                    else:
+                        await db.execute("SELECT pg_notify($1, '')", NOTIFY_CHANNEL)
+                else:
+                    result = await db.execute(
+                        """
+                        UPDATE scrape_jobs
+                        SET status = $2, error = $3, finished_at = NOW(),
+                            lease_owner = NULL, lease_expires_at = NULL
+                        WHERE id = $1 AND (lease_owner = $4 OR status = 'pending')
+                        """,
+                        uuid.UUID(job_id),
+                        status,
+                        error,
+                        self.node_id,
+                    )
+                    if result == "UPDATE 0":
+                        if status == "cancelled":
+                            # Claimed by another node before our cancel landed: ask it
+                            job = self.manager.get_job(job_id)
+                            await self._request_cancel(
+                                job_id, error or "Cancelled", job.error_type if job else status
+                            )
+                        continue
+                await self._announce(job_id, "pending" if status == "deferred" else status, error)
+            except Exception as e:
+                logger.error(f"Failed to persist status of job {job_id}: {e}")
+            finally:
+                self._writes.task_done()
+
+    async def _lease_loop(self):
+        """Heartbeat our leases and reclaim leases other nodes let expire."""
+        while True:
+            await asyncio.sleep(settings.queue_lease_seconds / 3)
+            try:
+                if self._leased:
+                    await db.execute(
+                        """
+                        UPDATE scrape_jobs
+                        SET lease_expires_at = NOW() + make_interval(secs => $3)
+                        WHERE id = ANY($1::uuid[]) AND lease_owner = $2
+                        """,
+                        [uuid.UUID(job_id) for job_id in self._leased],
+                        self.node_id,
+                        float(settings.queue_lease_seconds),
+                    )
+
+                reclaimed = await db.fetch(
+                    """
+                    UPDATE scrape_jobs
+                    SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL,
+                        started_at = NULL, run_after = NOW()
+                    WHERE status = 'running' AND lease_expires_at < NOW()
+                    RETURNING id
+                    """
+                )
+                if reclaimed:
+                    logger.warning(f"Reclaimed {len(reclaimed)} jobs with expired leases")
+                    await db.execute("SELECT pg_notify($1, '')", NOTIFY_CHANNEL)
+
+                self._pending = await db.fetchval(
+                    "SELECT COUNT(*) FROM scrape_jobs WHERE status = 'pending'"
+                )
+            except Exception as e:
+                logger.error(f"Queue lease loop error: {e}")
+
+
+QUEUE_BACKENDS: dict[str, type[QueueBackend]] = {
+    "memory": MemoryQueue,
+    "postgres": PostgresQueue,
+}
+
 
 class WorkerManager:
     """Manages job queue and workers."""
 
     def __init__(self):
-        self.queue: asyncio.Queue = asyncio.Queue()
-        self.jobs: dict[str, dict[str, Any]] = {}
+        self.queue: QueueBackend = QUEUE_BACKENDS[settings.queue_backend](self)
+        # Insertion-ordered: reversed() iterates newest first without sorting
+        self.jobs: dict[str, JobRecord] = {}
+        # The same jobs by seq, for list_jobs() to bisect to a cursor; evicted
+        # jobs are skipped and compacted away by cleanup_old_jobs()
+        self._order: list[JobRecord] = []
+        # Status buckets, moved between on every transition; len() is the count
+        self._by_status: dict[str, dict[str, JobRecord]] = {s: {} for s in JOB_STATUSES}
+        self.batches: dict[str, dict[str, Any]] = {}
+        # (template_id, url) -> pending/running job that duplicates can attach to
+        self._inflight: dict[tuple[int, str], JobRecord] = {}
         self.worker_tasks: list[asyncio.Task] = []
+        self._retention_task: asyncio.Task | None = None
+        self.supervisor = None  # ProcessSupervisor in supervisor mode
         self._running = False
+        self._seq = 0
+        self.stats = {
+            "success": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "evicted": 0,
+            "deferred": 0,
+            "retried": 0,
+            "coalesced": 0,
+            "cancelled": 0,
+        }
+        # job_id -> task running it, so running jobs can be cancelled
+        self.job_tasks: dict[str, asyncio.Task] = {}
 
     @property
     def worker_count(self) -> int:
@@ -22,103 +693,464 @@ class WorkerManager:
 
     @property
     def pending_count(self) -> int:
-        return sum(1 for j in self.jobs.values() if j["status"] == "pending")
+        return len(self._by_status["pending"])
 
     @property
     def running_count(self) -> int:
-        return sum(1 for j in self.jobs.values() if j["status"] == "running")
+        return len(self._by_status["running"])
+
+    def _add_job(self, job_id: str, template_id: int, url: str, **kwargs) -> JobRecord:
+        self._seq += 1
+        job = JobRecord(self._seq, job_id, template_id, url, **kwargs)
+        self.jobs[job_id] = job
+        self._order.append(job)
+        self._by_status[job.status][job_id] = job
+        batch = self.batches.get(job.batch_id)
+        if batch is not None:
+            batch["job_ids"].append(job_id)
+        if event_bus:
+            event_bus.publish(job_event(job))
+        return job
+
+    def _remove_job(self, job_id: str):
+        job = self.jobs.pop(job_id)
+        self._by_status[job.status].pop(job_id, None)
+
+    def _new_job(
+        self,
+        template_id: int,
+        url: str,
+        schedule_id: int | None = None,
+        batch_id: str | None = None,
+        priority: str = "interactive",
+        deadline: datetime | None = None,
+    ) -> JobRecord:
+        return self._add_job(
+            str(uuid.uuid4()),
+            template_id,
+            url,
+            schedule_id=schedule_id,
+            batch_id=batch_id,
+            priority=priority,
+            deadline=deadline,
+        )
 
     async def create_job(
         self,
         template_id: int,
         url: str,
         schedule_id: int | None = None,
+        priority: str = "interactive",
+        deadline: datetime | None = None,
+    ) -> JobRecord:
+        """
+        Create a new job and enqueue it.
+
+        If the same (template_id, url) is already pending or running and was
+        submitted within COALESCE_WINDOW_SECONDS, that job is returned instead
+        and the caller shares its result. A job still pending at its deadline
+        is dropped when dequeued.
+        """
+        existing = self._coalesce(template_id, url, priority, deadline)
+        if existing:
+            return existing
+
+        job = self._new_job(template_id, url, schedule_id, priority=priority, deadline=deadline)
+        self._inflight[(template_id, url)] = job
+        await self.queue.put(job)
+        logger.info(f"Job {job.id} created and enqueued")
+
+        return job
+
+    def _coalesce(
+        self,
+        template_id: int,
+        url: str,
+        priority: str,
+        deadline: datetime | None,
+    ) -> JobRecord | None:
+        # With the Postgres queue this node's copy of a job may lag the table
+        # (another node may have finished it), so requests aren't coalesced
+        if settings.coalesce_window_seconds <= 0 or settings.queue_backend == "postgres":
+            return None
+        job = self._inflight.get((template_id, url))
+        if not job or job.status not in ("pending", "running"):
+            return None
+        if (datetime.now() - job.created_at).total_seconds() > settings.coalesce_window_seconds:
+            return None
+        # Don't park an urgent request behind a queued lower-priority job
+        if job.status == "pending" and PRIORITIES.index(priority) < PRIORITIES.index(job.priority):
+            return None
+
+        # The shared job must stay wanted as long as any of its requesters wants it
+        if job.deadline and (deadline is None or deadline > job.deadline):
+            job.deadline = deadline
+        job.coalesced += 1
+        self.stats["coalesced"] += 1
+        logger.info(f"Coalesced request for {url} into job {job.id}")
+        return job
+
+    async def create_batch(
+        self,
+        template_id: int,
+        urls: list[str],
+        priority: str = "backfill",
+        deadline: datetime | None = None,
     ) -> dict[str, Any]:
-        """Create a new job and enqueue it."""
-        job_id = str(uuid.uuid4())
-        job = {
-            "id": job_id,
+        """
+        Create one job per URL for a template and enqueue them in bulk.
+
+        Each URL is an ordinary job, so a batch's pages are fetched in
+        parallel by the workers (WORKER_COUNT, per process in supervisor mode).
+        """
+        batch_id = str(uuid.uuid4())
+        batch = {
+            "id": batch_id,
             "template_id": template_id,
-            "schedule_id": schedule_id,
-            "url": url,
-            "status": "pending",
+            "total": len(urls),
+            "counts": {
+                "pending": len(urls),
+                "running": 0,
+                "success": 0,
+                "failed": 0,
+                "cancelled": 0,
+            },
+            "job_ids": [],
             "created_at": datetime.now(),
-            "started_at": None,
             "finished_at": None,
-            "result": None,
-            "error": None,
         }
+        self.batches[batch_id] = batch
 
-        self.jobs[job_id] = job
-        await self.queue.put(job_id)
-        logger.info(f"Job {job_id} created and enqueued")
+        jobs = [
+            self._new_job(template_id, url, batch_id=batch_id, priority=priority, deadline=deadline)
+            for url in urls
+        ]
+        await self.queue.put_many(jobs)
 
-        return job
+        logger.info(f"Batch {batch_id} created with {len(urls)} jobs")
+        return batch
 
-    def get_job(self, job_id: str) -> dict[str, Any] | None:
+    def get_batch(self, batch_id: str) -> dict[str, Any] | None:
+        """Get batch by ID."""
+        return self.batches.get(batch_id)
+
+    async def requeue_job(self, job_id: str, delay: float = 0.0):
+        """Put a started job back on the queue after delay seconds, e.g. to retry it."""
+        job = self.jobs[job_id]
+        self.update_job(job_id, status="pending", started_at=None)
+        self.queue.requeue(job, delay)
+        logger.info(f"Job {job_id} requeued")
+
+    def defer_job(self, job: JobRecord, delay: float):
+        """Put a dequeued job back for later, e.g. while its domain is saturated."""
+        self.stats["deferred"] += 1
+        self.queue.requeue(job, delay, counted=False)
+
+    def park_job(self, job: JobRecord, domain: str):
+        """
+        Hold a dequeued job whose domain is saturated until the domain has
+        room, then put it back in the queue once (instead of every retry interval).
+        """
+        self.stats["deferred"] += 1
+        domain_limiter.park(
+            domain, job.id, functools.partial(self.queue.requeue, job, counted=False)
+        )
+
+    def cancel_job(
+        self,
+        job_id: str,
+        reason: str = "Cancelled",
+        error_type: str = "cancelled",
+    ) -> bool:
+        """
+        Cancel a pending or running job. Returns False if it already finished.
+
+        A pending job stays in the queue and is skipped when dequeued; a
+        running one has its task cancelled, which aborts the page and
+        discards its browser context. A job running on another node (Postgres
+        queue) is cancelled by that node; this copy follows once it is.
+        """
+        job = self.jobs.get(job_id)
+        if not job or job.status not in ("pending", "running"):
+            return False
+
+        if self.queue.runs_elsewhere(job):
+            # Its node cancels it; our copy follows the status it announces
+            self.queue.request_cancel(job, reason, error_type)
+            logger.info(f"Job {job_id} runs on another node, cancel requested: {reason}")
+            return True
+
+        self.update_job(
+            job_id,
+            status="cancelled",
+            finished_at=datetime.now(),
+            error=reason,
+            error_type=error_type,
+        )
+        self.queue.cancel(job)
+
+        task = self.job_tasks.get(job_id)
+        if task:
+            task.cancel()
+        logger.info(f"Job {job_id} cancelled: {reason}")
+        return True
+
+    def cancel_batch(self, batch_id: str) -> int:
+        """Cancel every unfinished job of a batch. Returns how many were cancelled."""
+        batch = self.batches.get(batch_id)
+        if not batch:
+            return 0
+        return sum(
+            self.cancel_job(job_id, reason="Batch cancelled")
+            for job_id in batch["job_ids"]
+            if job_id in self.jobs
+        )
+
+    def get_job(self, job_id: str) -> JobRecord | None:
         """Get job by ID."""
         return self.jobs.get(job_id)
 
-    def list_jobs(self, status: str | None = None) -> list[dict[str, Any]]:
-        """List all jobs, optionally filtered by status."""
-        jobs = list(self.jobs.values())
+    def list_jobs(
+        self,
+        status: str | None = None,
+        batch_id: str | None = None,
+        limit: int | None = None,
+        cursor: int | None = None,
+    ) -> list[JobRecord]:
+        """
+        List jobs newest first, optionally filtered by status and batch.
+
+        cursor is the seq of the last job of the previous page; only older
+        jobs are returned.
+        """
+        if batch_id:
+            batch = self.batches.get(batch_id)
+            if not batch:
+                return []
+            # Bounded by the batch's size
+            jobs = (
+                self.jobs[job_id] for job_id in reversed(batch["job_ids"]) if job_id in self.jobs
+            )
+            if cursor is not None:
+                jobs = itertools.dropwhile(lambda j: j.seq >= cursor, jobs)
+            if status:
+                jobs = (j for j in jobs if j.status == status)
+            return list(itertools.islice(jobs, limit))
+
         if status:
-            jobs = [j for j in jobs if j["status"] == status]
-        return sorted(jobs, key=lambda j: j["created_at"], reverse=True)
+            # Only the status' bucket; it's in transition order, so pick the newest by seq
+            jobs = self._by_status[status].values()
+            if cursor is not None:
+                jobs = (j for j in jobs if j.seq < cursor)
+            if limit is None:
+                return sorted(jobs, key=lambda j: j.seq, reverse=True)
+            return heapq.nlargest(limit, jobs, key=lambda j: j.seq)
+
+        end = len(self._order)
+        if cursor is not None:
+            end = bisect.bisect_left(self._order, cursor, key=lambda j: j.seq)
+        jobs = (self._order[i] for i in range(end - 1, -1, -1) if self._order[i].id in self.jobs)
+        return list(itertools.islice(jobs, limit))
 
     async def start_workers(self, count: int):
-        """Start worker tasks."""
+        """
+        Start worker tasks.
+
+        With WORKER_PROCESSES > 0 (supervisor mode) jobs run in that many
+        worker processes, count concurrent jobs each; the tasks started here
+        only dispatch to them.
+        """
         from app.workers.scraper import ScraperWorker
 
         self._running = True
+        await self.queue.start()
+
+        if settings.worker_processes > 0:
+            from app.workers.supervisor import ProcessSupervisor, ProcessWorker
 
-        for i in range(count):
-            worker = ScraperWorker(self, i)
+            self.supervisor = ProcessSupervisor(self, settings.worker_processes)
+            await self.supervisor.start()
+            workers = [
+                ProcessWorker(self, i, self.supervisor, i % settings.worker_processes)
+                for i in range(count * settings.worker_processes)
+            ]
+        else:
+            workers = [ScraperWorker(self, i) for i in range(count)]
+
+        for worker in workers:
             task = asyncio.create_task(worker.run())
             self.worker_tasks.append(task)
 
-        logger.info(f"Started {count} workers")
+        self._retention_task = asyncio.create_task(self._retention_loop())
+        logger.info(f"Started {len(workers)} workers")
 
-    async def stop_workers(self):
-        """Stop all worker tasks."""
-        self._running = False
+    async def stop_workers(self, grace_seconds: float | None = None) -> dict[str, int]:
+        """
+        Stop workers gracefully.
 
-        # Cancel all worker tasks
-        for task in self.worker_tasks:
-            task.cancel()
+        Intake stops first (the queue is closed, idle workers exit). Jobs in
+        flight get grace_seconds (SHUTDOWN_GRACE_SECONDS) to finish; the rest
+        are cancelled and checkpointed back to pending (with the Postgres
+        queue another node picks them up).
+
+        Returns:
+            dict with drained (finished during the grace period) and abandoned counts
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.shutdown_grace_seconds
 
-        # Wait for all tasks to complete
+        self._running = False
+        self.queue.close()
+
+        # Only what runs here: with the Postgres queue, running jobs of other
+        # nodes are mirrored too and aren't this node's to drain or requeue
+        in_flight = [job for job in self._by_status["running"].values() if job.id in self.job_tasks]
+        # The worker processes drain (and stop respawning) while the
+        # dispatching tasks wait on them: one grace period, not two
+        supervisor_stop = asyncio.create_task(self.supervisor.stop()) if self.supervisor else None
         if self.worker_tasks:
+            logger.info(f"Draining {len(in_flight)} in-flight jobs (grace {grace_seconds:g}s)")
+            _, pending = await asyncio.wait(self.worker_tasks, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
             await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        if supervisor_stop:
+            await supervisor_stop
+            self.supervisor = None
+
+        parked = domain_limiter.drop_parked()
+        if parked:
+            # Parked jobs are still pending here (and leased, with the Postgres
+            # queue, until queue.stop() hands the leases back)
+            logger.info(f"Dropped {parked} jobs parked on saturated domains")
+
+        abandoned = [job for job in in_flight if job.status == "running"]
+        for job in abandoned:
+            self.update_job(job.id, status="pending", started_at=None)
+            self.queue.requeue(job, counted=False)
+        report = {"drained": len(in_flight) - len(abandoned), "abandoned": len(abandoned)}
+        self.stats["drained"] = self.stats.get("drained", 0) + report["drained"]
+        self.stats["abandoned"] = self.stats.get("abandoned", 0) + report["abandoned"]
 
         self.worker_tasks.clear()
-        logger.info("All workers stopped")
+        if self._retention_task:
+            self._retention_task.cancel()
+            self._retention_task = None
+        await self.queue.stop()
+        logger.info(
+            f"All workers stopped: {report['drained']} jobs drained, "
+            f"{report['abandoned']} abandoned"
+        )
+        return report
 
     def is_running(self) -> bool:
         return self._running
 
     def update_job(self, job_id: str, **kwargs):
         """Update job fields."""
-        if job_id in self.jobs:
-            self.jobs[job_id].update(kwargs)
+        job = self.jobs.get(job_id)
+        if not job:
+            return
+
+        old_status = job.status
+        if old_status in FINISHED_STATUSES and kwargs.get("status", old_status) != old_status:
+            # Late report for a job already finished, e.g. cancelled while it was starting
+            logger.debug(f"Job {job_id} is {old_status}, not moving it to {kwargs['status']}")
+            return
+        for key, value in kwargs.items():
+            setattr(job, key, value)
+        self.queue.job_updated(job, old_status)
+
+        if job.status == old_status:
+            return
+
+        del self._by_status[old_status][job_id]
+        self._by_status[job.status][job_id] = job
+        # Events are only built when someone listens
+        if event_bus:
+            event_bus.publish(job_event(job))
+
+        if job.status in FINISHED_STATUSES:
+            self.stats[job.status] += 1
+            key = (job.template_id, job.url)
+            if self._inflight.get(key) is job:
+                del self._inflight[key]
 
-    def cleanup_old_jobs(self, max_age_hours: int = 24):
-        """Remove old completed jobs from memory."""
-        cutoff = datetime.now()
+        batch = self.batches.get(job.batch_id)
+        if batch:
+            batch["counts"][old_status] -= 1
+            batch["counts"][job.status] += 1
+            done = sum(batch["counts"][status] for status in FINISHED_STATUSES)
+            if done == batch["total"]:
+                batch["finished_at"] = datetime.now()
+                logger.info(f"Batch {batch['id']} finished")
+            if event_bus:
+                event_bus.publish(batch_event(batch))
+
+    async def _retention_loop(self):
+        """Periodically evict finished jobs past their TTL or over the count limit."""
+        while True:
+            await asyncio.sleep(settings.job_retention_interval_seconds)
+            try:
+                self.cleanup_old_jobs()
+            except Exception as e:
+                logger.error(f"Job retention error: {e}")
+
+    def cleanup_old_jobs(
+        self,
+        max_age_seconds: float | None = None,
+        max_jobs: int | None = None,
+    ) -> int:
+        """
+        Remove finished jobs from memory. Their results already live in scrape_results.
+
+        Drops jobs finished more than max_age_seconds ago, then the oldest
+        finished jobs until at most max_jobs remain. Returns the number evicted.
+        """
+        if max_age_seconds is None:
+            max_age_seconds = settings.job_retention_seconds
+        if max_jobs is None:
+            max_jobs = settings.job_retention_max
+
+        now = datetime.now()
         to_remove = []
 
-        for job_id, job in self.jobs.items():
-            if job["status"] in ("success", "failed"):
-                if job.get("finished_at"):
-                    age = (cutoff - job["finished_at"]).total_seconds() / 3600
-                    if age > max_age_hours:
-                        to_remove.append(job_id)
+        # Buckets are ordered by transition time, so the oldest come first
+        finished = heapq.merge(
+            *(self._by_status[status].values() for status in FINISHED_STATUSES),
+            key=lambda j: j.finished_at or j.created_at,
+        )
+        excess = sum(len(self._by_status[status]) for status in FINISHED_STATUSES) - max_jobs
+        for job in finished:
+            expired = (now - (job.finished_at or job.created_at)).total_seconds() > max_age_seconds
+            if not expired and len(to_remove) >= excess:
+                break
+            to_remove.append(job.id)
 
         for job_id in to_remove:
-            del self.jobs[job_id]
+            self._remove_job(job_id)
+        if to_remove:
+            self._order = list(self.jobs.values())
+
+        # Finished batches go with the TTL; their jobs are evicted above
+        for batch_id, batch in list(self.batches.items()):
+            finished_at = batch["finished_at"]
+            if finished_at and (now - finished_at).total_seconds() > max_age_seconds:
+                del self.batches[batch_id]
 
         if to_remove:
-            logger.info(f"Cleaned up {len(to_remove)} old jobs")
+            self.stats["evicted"] += len(to_remove)
+            logger.info(f"Evicted {len(to_remove)} finished jobs")
+        return len(to_remove)
+
+    def memory(self) -> dict[str, float | None]:
+        """What the job store holds, for sizing instances."""
+        return {
+            "jobs": len(self.jobs),
+            "finished": sum(len(self._by_status[status]) for status in FINISHED_STATUSES),
+            "batches": len(self.batches),
+            "rss_mb": _rss_mb(),
+        }
 
 
 # Global manager instance
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Delay hint try_acquire() returns for a domain at its concurrency cap
+CONCURRENCY_RETRY_SECONDS = 0.5
+
+# A resumed job holds a slot of its domain until it comes back to try_acquire();
+# one that never does (cancelled on its way through the queue) at most this long
+RESUME_GRACE_SECONDS = 5.0
+
+
+class DomainLimiter:
+    """
+    Token bucket and concurrency cap per target domain, checked before a job starts.
+
+    Jobs refused by try_acquire() are parked per domain and resumed one at a
+    time, when release() frees a slot or the bucket has a token again, so
+    a saturated domain doesn't cycle its jobs through the queue.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, list[float]] = {}  # domain -> [tokens, last refill]
+        self._active: dict[str, int] = {}
+        self._limits: dict[str, dict[str, float]] = {}  # domain -> limits last checked
+        self._parked: dict[str, deque[tuple[str, Callable[[], None]]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._resumed: dict[str, dict[str, float]] = {}  # domain -> {job key: resume time}
+
+    @staticmethod
+    def limits(config: dict | None = None) -> dict[str, float]:
+        """Global limits, overridden by a template's config.politeness."""
+        limits = {
+            "rate_per_second": settings.domain_rate_per_second,
+            "burst": settings.domain_burst,
+            "max_concurrency": settings.domain_max_concurrency,
+        }
+        limits.update((config or {}).get("politeness") or {})
+        return limits
+
+    def try_acquire(self, domain: str, limits: dict[str, float], key: str | None = None) -> float:
+        """
+        Take a slot for a job on domain.
+
+        Returns 0 when the job may start (release() must follow), otherwise
+        the number of seconds until a slot may free up; park() the job then.
+        key identifies the job, so a resumed one gives back its reservation.
+        """
+        self._limits[domain] = limits
+        resumed = self._resumed.get(domain)
+        if resumed and resumed.pop(key, None) is not None and not resumed:
+            del self._resumed[domain]
+
+        max_concurrency = limits.get("max_concurrency") or 0
+        if max_concurrency and self._active.get(domain, 0) >= max_concurrency:
+            return CONCURRENCY_RETRY_SECONDS
+
+        rate = limits.get("rate_per_second") or 0
+        if rate > 0:
+            burst = max(limits.get("burst") or 1, 1)
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(domain, [burst, now])
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return (1 - tokens) / rate
+            bucket[0] = tokens - 1
+
+        self._active[domain] = self._active.get(domain, 0) + 1
+        return 0.0
+
+    def release(self, domain: str):
+        """Free the slot taken by try_acquire(), making room for a parked job."""
+        active = self._active.get(domain, 0) - 1
+        if active > 0:
+            self._active[domain] = active
+        else:
+            self._active.pop(domain, None)
+        self._arm(domain)
+
+    def park(self, domain: str, key: str, resume: Callable[[], None]):
+        """
+        Hold a job refused by try_acquire() until its domain may have room.
+
+        resume is called once (on the event loop) to put the job back in the
+        queue; its slot stays reserved until the job calls try_acquire() again
+        with the same key.
+        """
+        self._parked.setdefault(domain, deque()).append((key, resume))
+        self._arm(domain)
+
+    def drop_parked(self) -> int:
+        """Forget every parked job (shutdown). Returns how many there were."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._resumed.clear()
+        count = sum(len(parked) for parked in self._parked.values())
+        self._parked.clear()
+        return count
+
+    def _arm(self, domain: str):
+        """
+        (Re)schedule the resume of the domain's next parked job, for when it
+        may have room. Called whenever that changes: park(), release(), a resume.
+        """
+        timer = self._timers.pop(domain, None)
+        if timer:
+            timer.cancel()
+        if domain not in self._parked:
+            return
+
+        # Resumed jobs on their way back through the queue will claim room too
+        now = time.monotonic()
+        resumed = self._resumed.get(domain)
+        if resumed:
+            for key in [key for key, at in resumed.items() if now - at > RESUME_GRACE_SECONDS]:
+                del resumed[key]
+            if not resumed:
+                del self._resumed[domain]
+                resumed = None
+        reserved = len(resumed) if resumed else 0
+
+        limits = self._limits.get(domain) or {}
+        max_concurrency = limits.get("max_concurrency") or 0
+        if max_concurrency and self._active.get(domain, 0) + reserved >= max_concurrency:
+            if not reserved:
+                return  # release() re-arms
+            # A resumed job that never comes back only holds its slot until its grace ends
+            delay = min(resumed.values()) + RESUME_GRACE_SECONDS - now
+        else:
+            delay = 0.0
+            rate = limits.get("rate_per_second") or 0
+            bucket = self._buckets.get(domain)
+            if rate > 0 and bucket:
+                burst = max(limits.get("burst") or 1, 1)
+                tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                delay = max(0.0, (1 + reserved - tokens) / rate)
+
+        self._timers[domain] = asyncio.get_running_loop().call_later(delay, self._wake, domain)
+
+    def _wake(self, domain: str):
+        self._timers.pop(domain, None)
+        parked = self._parked.get(domain)
+        if not parked:
+            return
+        key, resume = parked.popleft()
+        if not parked:
+            del self._parked[domain]
+        self._resumed.setdefault(domain, {})[key] = time.monotonic()
+        try:
+            resume()
+        except Exception as e:
+            logger.error(f"Failed to resume a job parked on {domain}: {e}")
+        self._arm(domain)
+
+    def snapshot(self) -> dict[str, int]:
+        """Jobs currently running per domain."""
+        return dict(self._active)
+
+    def parked(self) -> int:
+        """Jobs waiting for a domain slot."""
+        return sum(len(parked) for parked in self._parked.values())
+
+
+# Global domain limiter instance
+domain_limiter = DomainLimiter()
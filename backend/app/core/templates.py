@@ -0,0 +1,36 @@
+import logging
+import time
+from typing import Any
+
+from app.config import settings
+from app.core.database import db
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """Short-lived cache of scrape_templates rows, saving a DB round trip per job."""
+
+    def __init__(self):
+        self._entries: dict[int, tuple[float, Any]] = {}
+
+    async def get(self, template_id: int) -> Any:
+        """Get a template row by ID, or None if it doesn't exist."""
+        entry = self._entries.get(template_id)
+        if entry and time.monotonic() - entry[0] < settings.template_cache_seconds:
+            return entry[1]
+
+        row = await db.fetchrow("SELECT * FROM scrape_templates WHERE id = $1", template_id)
+        if row:
+            self._entries[template_id] = (time.monotonic(), row)
+        else:
+            self._entries.pop(template_id, None)
+        return row
+
+    def invalidate(self, template_id: int):
+        """Drop a template after it was updated or deleted."""
+        self._entries.pop(template_id, None)
+
+
+# Global template cache instance
+template_cache = TemplateCache()
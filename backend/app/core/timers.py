@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel for delayed callbacks (retries, deferred jobs).
+
+    Scheduling is O(1) and a single task ticks the wheel, instead of one
+    sleeping task or worker per delayed job. Delays longer than one
+    revolution are tracked as remaining rounds. The task sleeps straight to
+    the next slot holding timers, and while the wheel is empty, until a
+    timer is scheduled.
+    """
+
+    def __init__(self, tick_seconds: float = 0.25, slots: int = 1024):
+        self.tick_seconds = tick_seconds
+        self._slots: list[list[list]] = [[] for _ in range(slots)]
+        # Ticks are numbered from _epoch; _tick is the last one processed
+        self._epoch = time.monotonic()
+        self._tick = 0
+        self._count = 0
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]):
+        """Call callback (synchronously, on the event loop) after about delay seconds."""
+        now = time.monotonic() - self._epoch
+        if not self._count:
+            # Idle: nothing is due in the ticks the task slept through
+            self._tick = max(self._tick, math.floor(now / self.tick_seconds))
+        n = len(self._slots)
+        target = max(self._tick + 1, math.ceil((now + delay) / self.tick_seconds))
+        self._slots[target % n].append([(target - self._tick - 1) // n, callback])
+        self._count += 1
+        self._changed.set()
+
+    def _next_due(self) -> int:
+        """Tick of the next slot holding timers (due now or in a later round)."""
+        n = len(self._slots)
+        for ahead in range(1, n + 1):
+            if self._slots[(self._tick + ahead) % n]:
+                return self._tick + ahead
+        return self._tick + n
+
+    async def _run(self):
+        while True:
+            self._changed.clear()
+            if not self._count:
+                await self._changed.wait()
+                continue
+
+            # Ticks fall on absolute times so slow callbacks don't accumulate drift
+            tick = self._next_due()
+            delay = self._epoch + tick * self.tick_seconds - time.monotonic()
+            if delay > 0:
+                # Woken early when a timer lands in an earlier slot
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+
+            self._tick = tick
+            slot = self._slots[tick % len(self._slots)]
+            due = [entry[1] for entry in slot if entry[0] == 0]
+            slot[:] = [[rounds - 1, callback] for rounds, callback in slot if rounds > 0]
+            self._count -= len(due)
+
+            for callback in due:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Timer callback failed: {e}")
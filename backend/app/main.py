@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -23,23 +25,26 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
 
-    # Connect to database
-    await db.connect()
-
-    # Start workers
-    await manager.start_workers(settings.worker_count)
-
-    # Start scheduler
     from app.scheduler.jobs import scheduler_manager
+    from app.scraping.browser import browser_pool
 
-    await scheduler_manager.start()
+    started = time.monotonic()
 
-    # Start browser pool
-    from app.scraping.browser import browser_pool
+    # Connect to database and launch the browser concurrently
+    # (in lazy mode the browser starts with the first job instead; in
+    # supervisor mode each worker process launches its own)
+    startup = [db.connect()]
+    if not (settings.browser_lazy_start or settings.worker_processes):
+        startup.append(browser_pool.start())
+    await asyncio.gather(*startup)
 
-    await browser_pool.start()
+    # Start workers and scheduler (both need the database)
+    await asyncio.gather(
+        manager.start_workers(settings.worker_count),
+        scheduler_manager.start(),
+    )
 
-    logger.info("Application started successfully")
+    logger.info(f"Application started successfully in {int((time.monotonic() - started) * 1000)}ms")
 
     yield
 
@@ -55,6 +60,11 @@ async def lifespan(app: FastAPI):
     # Stop browser pool
     await browser_pool.stop()
 
+    # Close pooled HTTP connections
+    from app.scraping.http_engine import http_executor
+
+    await http_executor.stop()
+
     # Disconnect from database
     await db.disconnect()
 
@@ -75,6 +85,7 @@ app.add_middleware(
     allow_credentials=False,  # Must be False when using wildcard "*"
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API router
@@ -29,12 +29,12 @@ class SchedulerManager:
         if self._started:
             return
 
-        # Load all enabled schedules from database
-        await self._load_schedules()
-
-        # Start the scheduler
+        # Start the scheduler first so added jobs get their next run time computed
         self.scheduler.start()
         self._started = True
+
+        # Load all enabled schedules from database
+        await self._load_schedules()
         logger.info("Scheduler started")
 
     def stop(self):
@@ -50,13 +50,36 @@ class SchedulerManager:
             "SELECT * FROM scrape_schedules WHERE is_enabled = true"
         )
 
+        # Register all jobs, then store every next_run_at in a single UPDATE
+        ids = []
+        next_runs = []
         for row in rows:
-            await self._add_job(row)
+            next_run = await self._add_job(row, persist=False)
+            if next_run:
+                ids.append(row["id"])
+                next_runs.append(next_run)
+
+        if ids:
+            await db.execute(
+                """
+                UPDATE scrape_schedules AS s
+                SET next_run_at = v.next_run_at
+                FROM unnest($1::int[], $2::timestamp[]) AS v(id, next_run_at)
+                WHERE s.id = v.id
+                """,
+                ids,
+                next_runs,
+            )
 
         logger.info(f"Loaded {len(rows)} schedules from database")
 
-    async def _add_job(self, schedule: dict):
-        """Add a job to the scheduler based on schedule config."""
+    async def _add_job(self, schedule: dict, persist: bool = True) -> datetime | None:
+        """
+        Add a job to the scheduler based on schedule config.
+
+        Returns the next run time. It is written to next_run_at unless persist
+        is False (bulk loading writes all of them at once).
+        """
         schedule_id = schedule["id"]
         job_id = f"schedule_{schedule_id}"
 
@@ -66,12 +89,12 @@ class SchedulerManager:
                 trigger = CronTrigger.from_crontab(schedule["cron_expression"])
             except Exception as e:
                 logger.error(f"Invalid cron expression for schedule {schedule_id}: {e}")
-                return
+                return None
         elif schedule["interval_minutes"]:
             trigger = IntervalTrigger(minutes=schedule["interval_minutes"])
         else:
             logger.warning(f"Schedule {schedule_id} has no cron or interval configured")
-            return
+            return None
 
         # Add job
         self.scheduler.add_job(
@@ -85,14 +108,16 @@ class SchedulerManager:
 
         # Update next_run_at in database
         job = self.scheduler.get_job(job_id)
-        if job and job.next_run_time:
+        next_run = job.next_run_time.replace(tzinfo=None) if job and job.next_run_time else None
+        if next_run and persist:
             await db.execute(
                 "UPDATE scrape_schedules SET next_run_at = $1 WHERE id = $2",
-                job.next_run_time.replace(tzinfo=None),
+                next_run,
                 schedule_id,
             )
 
         logger.info(f"Added schedule {schedule_id} ({schedule['name']}) to scheduler")
+        return next_run
 
     async def _execute_job(self, schedule_id: int):
         """Execute a scheduled scraping job."""
@@ -117,6 +142,7 @@ class SchedulerManager:
             template_id=schedule["template_id"],
             url=schedule["url"],
             schedule_id=schedule_id,
+            priority="scheduled",
         )
 
         # Update last_run_at and next_run_at
@@ -173,7 +199,7 @@ class SchedulerManager:
             schedule_id,
         )
 
-        return job["id"]
+        return job.id
 
     def get_job_info(self, schedule_id: int) -> dict | None:
         """Get information about a scheduled job."""
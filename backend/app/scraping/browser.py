@@ -1,58 +1,327 @@
 import asyncio
+import functools
+import json
 import logging
+import re
+import time
+from collections import deque
 from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlparse
 
+import tldextract
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Pages served between renderer heap checks (each check costs CDP round trips)
+HEAP_CHECK_EVERY = 10
+
+# A warm page that takes longer than this to reset is replaced
+PAGE_RESET_TIMEOUT = 5
+
+# Closing a context with a hung renderer gives up after this long
+CONTEXT_CLOSE_TIMEOUT = 5
+
+# Restores a saved origin's localStorage without clobbering newer values
+# Marks an origin's localStorage as restored, so keys the site deletes later
+# aren't brought back on the next navigation (cleared along with the storage)
+RESTORED_MARKER = "__scraper_session_restored"
+
+RESTORE_LOCAL_STORAGE_JS = """
+(() => {
+    const origin = %s;
+    const items = %s;
+    const marker = %s;
+    if (location.origin !== origin) return;
+    try {
+        if (localStorage.getItem(marker) !== null) return;
+        for (const { name, value } of items) {
+            if (localStorage.getItem(name) === null) localStorage.setItem(name, value);
+        }
+        localStorage.setItem(marker, "1");
+    } catch (e) {}
+})();
+"""
+
+CLEAR_STORAGE_JS = """
+() => {
+    try { localStorage.clear(); } catch (e) {}
+    try { sessionStorage.clear(); } catch (e) {}
+}
+"""
+
+# Well-known ad/analytics hosts, matched as URL substrings
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "scorecardresearch.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+# Named request-blocking profiles, selected per template via config.blocking
+BLOCKING_PROFILES: dict[str, dict] = {
+    "none": {},
+    "no-media": {
+        "resource_types": {"image", "media", "font"},
+    },
+    "text-only": {
+        "resource_types": {"image", "media", "font", "stylesheet"},
+        "block_trackers": True,
+    },
+    "first-party-only": {
+        "block_trackers": True,
+        "first_party_only": True,
+    },
+}
+
+
+# Public suffix list snapshot bundled with tldextract: no fetch at runtime
+_public_suffixes = tldextract.TLDExtract(
+    suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _site_of(host: str) -> str:
+    """
+    Registrable domain of a host, public suffix aware (www.loja.com.br ->
+    loja.com.br, not com.br). Hosts without one (IPs, localhost) are their own site.
+    """
+    return _public_suffixes(host).top_domain_under_public_suffix or host
+
+
+class RequestBlocker:
+    """Route handler applying a blocking profile to a page's requests."""
+
+    def __init__(self, profile: dict, stats: dict[str, int]):
+        self.resource_types = profile.get("resource_types", set())
+        self.block_trackers = profile.get("block_trackers", False)
+        self.first_party_only = profile.get("first_party_only", False)
+        self.stats = stats
+        self.first_party: str | None = None
+
+    def _should_block(self, request) -> bool:
+        if request.resource_type in self.resource_types:
+            return True
+
+        url = request.url
+        if self.block_trackers and any(host in url for host in TRACKER_HOSTS):
+            return True
+
+        if self.first_party_only:
+            host = urlparse(url).hostname or ""
+            if request.is_navigation_request() and request.frame.parent_frame is None:
+                # Main document defines what first-party means for this page
+                self.first_party = _site_of(host)
+                return False
+            if self.first_party and host and _site_of(host) != self.first_party:
+                return True
+
+        return False
+
+    async def handle(self, route):
+        """Abort blocked requests, let everything else through."""
+        if self._should_block(route.request):
+            self.stats["blocked_requests"] += 1
+            await route.abort("blockedbyclient")
+        else:
+            self.stats["allowed_requests"] += 1
+            await route.continue_()
+
+    def on_response(self, response):
+        """Account downloaded bytes from the Content-Length header."""
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.stats["allowed_bytes"] += int(length)
+
+
+class BrowserCrashedError(RuntimeError):
+    """The browser process serving a page died while the page was in use."""
+
+
+class BrowserShard:
+    """One Chromium process of the pool."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Browser | None = None
+        self.generation = 0  # Bumped on every (re)launch
+        self.contexts = 0
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class ContextInfo:
+    """Bookkeeping for one pooled context."""
+
+    __slots__ = ("shard", "generation", "created_at", "pages", "page", "sites", "restore_scripts")
+
+    def __init__(self, shard: BrowserShard):
+        self.shard = shard
+        self.generation = shard.generation
+        self.created_at = time.monotonic()
+        self.pages = 0
+        self.page: Page | None = None  # Warm page kept between jobs
+        self.sites: set[str] = set()  # Sites whose session this context holds
+        self.restore_scripts: set[str] = set()  # Origins with a localStorage restore script
+
 
 class BrowserPool:
-    """Pool of browser contexts for scraping."""
+    """
+    Elastic pool of browser contexts for scraping.
+
+    Keeps between browser_pool_min and browser_pool_size contexts. The pool
+    grows when jobs are waiting in the manager queue and idle contexts are
+    closed after browser_pool_idle_seconds.
+
+    Contexts are spread over browser_processes Chromium processes (least
+    loaded first). A crashed process is relaunched and only the jobs that
+    were using it see a BrowserCrashedError.
+
+    Contexts are recycled after context_max_pages pages, context_max_age_seconds
+    or when the renderer JS heap passes context_max_heap_mb. Spare contexts
+    are pre-created in the background to take their place immediately.
+
+    Each context keeps one warm page that is reset between jobs
+    (about:blank, routes removed) instead of being closed and recreated.
+
+    With session_affinity, jobs prefer an idle context that already holds
+    their site's cookies and cache. Each site's storage state is persisted
+    under session_dir and restored into cold contexts, also across restarts.
+    """
 
     def __init__(self):
         self.playwright = None
-        self.browser: Browser | None = None
-        self.contexts: asyncio.Queue[BrowserContext] = asyncio.Queue()
-        self._size = settings.browser_pool_size
+        self.shards: list[BrowserShard] = []
+        self._min = settings.browser_pool_min
+        self._max = settings.browser_pool_size
+        self._idle: deque[tuple[BrowserContext, float]] = deque()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._info: dict[BrowserContext, ContextInfo] = {}
+        self._spares: deque[BrowserContext] = deque()
+        self._filling_spares = False
+        self._sessions: dict[str, dict] = {}  # Site -> storage state
+        self._sessions_saved_at: dict[str, float] = {}
+        self._total = 0  # Open contexts plus contexts being created
+        self._in_use = 0
+        self._scaler_task: asyncio.Task | None = None
         self._initialized = False
+        self._stopping = False
+        self._start_lock = asyncio.Lock()
+        self.blocking_stats: dict[str, dict[str, int]] = {}
+        self.stats = {
+            "acquired": 0,
+            "waited": 0,
+            "wait_ms_total": 0,
+            "wait_ms_max": 0,
+            "created": 0,
+            "reaped": 0,
+            "crashes": 0,
+            "recycled_pages": 0,
+            "recycled_age": 0,
+            "recycled_heap": 0,
+            "pages_created": 0,
+            "pages_reused": 0,
+            "page_resets": 0,
+            "page_reset_failures": 0,
+            "page_reset_ms_total": 0,
+            "affinity_hits": 0,
+            "affinity_misses": 0,
+            "sessions_restored": 0,
+            "sessions_saved": 0,
+            "abandoned": 0,
+        }
 
     async def start(self):
-        """Initialize browser and create context pool."""
-        if self._initialized:
-            return
+        """Launch browser processes and create the initial contexts."""
+        async with self._start_lock:
+            if self._initialized:
+                return
+            await self._start()
 
+    async def _start(self):
+        started = time.monotonic()
+        self._stopping = False
         self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=settings.browser_headless,
-        )
+        self.shards = [BrowserShard(i) for i in range(max(1, settings.browser_processes))]
+        await asyncio.gather(*(self._launch(shard) for shard in self.shards))
 
-        # Create initial contexts
-        for _ in range(self._size):
-            context = await self._create_context()
-            await self.contexts.put(context)
+        # Create initial contexts in parallel
+        self._total += self._min
+        results = await asyncio.gather(
+            *(self._create_context() for _ in range(self._min)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._total -= 1
+                logger.error(f"Failed to create browser context: {result}")
+            else:
+                self._idle.append((result, time.monotonic()))
 
+        self._scaler_task = asyncio.create_task(self._scale_loop())
+        asyncio.create_task(self._fill_spares())
         self._initialized = True
-        logger.info(f"Browser pool started with {self._size} contexts")
+        logger.info(
+            f"Browser pool started with {len(self._idle)} contexts (max {self._max}) "
+            f"on {len(self.shards)} browser processes "
+            f"in {int((time.monotonic() - started) * 1000)}ms"
+        )
 
     async def stop(self):
-        """Close all contexts and browser."""
+        """Close all contexts and browsers."""
         if not self._initialized:
             return
 
+        self._stopping = True
+        if self._scaler_task:
+            self._scaler_task.cancel()
+            self._scaler_task = None
+
+        # Persist sessions held by idle contexts before closing them
+        for context, _ in self._idle:
+            for site in self._info[context].sites:
+                await self._save_session(context, site, force=True)
+
         # Close all contexts
-        while not self.contexts.empty():
+        contexts = [context for context, _ in self._idle] + list(self._spares)
+        self._idle.clear()
+        self._spares.clear()
+        for context in contexts:
             try:
-                context = self.contexts.get_nowait()
                 await context.close()
             except Exception:
                 pass
+        self._info.clear()
+        self._total = 0
 
-        # Close browser
-        if self.browser:
-            await self.browser.close()
+        # Close browsers
+        for shard in self.shards:
+            if shard.browser:
+                try:
+                    await shard.browser.close()
+                except Exception:
+                    pass
 
         # Stop playwright
         if self.playwright:
@@ -61,50 +330,499 @@ class BrowserPool:
         self._initialized = False
         logger.info("Browser pool stopped")
 
+    async def _launch(self, shard: BrowserShard):
+        """(Re)launch the Chromium process of a shard."""
+        shard.browser = await self.playwright.chromium.launch(
+            headless=settings.browser_headless,
+        )
+        shard.generation += 1
+        shard.contexts = 0
+        shard.browser.on("disconnected", lambda _: self._on_disconnected(shard))
+
+    def _on_disconnected(self, shard: BrowserShard):
+        """Drop a dead shard's idle contexts and relaunch it."""
+        if self._stopping:
+            return
+
+        self.stats["crashes"] += 1
+        logger.error(f"Browser process {shard.index} disconnected, restarting")
+
+        alive = deque()
+        for context, since in self._idle:
+            if self._info[context].shard is shard:
+                del self._info[context]
+                self._total -= 1
+            else:
+                alive.append((context, since))
+        self._idle = alive
+
+        for context in [c for c in self._spares if self._info[c].shard is shard]:
+            self._spares.remove(context)
+            del self._info[context]
+
+        asyncio.create_task(self._restart(shard))
+
+    async def _restart(self, shard: BrowserShard):
+        delay = 1
+        while not self._stopping:
+            try:
+                await self._launch(shard)
+                shard.restarts += 1
+                logger.info(f"Browser process {shard.index} restarted")
+                return
+            except Exception as e:
+                logger.error(f"Failed to restart browser process {shard.index}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
     async def _create_context(self) -> BrowserContext:
-        """Create a new browser context with default settings."""
-        return await self.browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
+        """Create a new browser context on the least loaded live shard."""
+        shards = [shard for shard in self.shards if shard.alive]
+        if not shards:
+            raise BrowserCrashedError("No browser process available")
+        shard = min(shards, key=lambda s: s.contexts)
+
+        # Count it before awaiting so parallel creations spread across shards
+        shard.contexts += 1
+        try:
+            context = await shard.browser.new_context(
+                viewport={"width": 1920, "height": 1080},
+                user_agent=USER_AGENT,
+            )
+        except Exception:
+            shard.contexts -= 1
+            raise
+        self._info[context] = ContextInfo(shard)
+        self.stats["created"] += 1
+        return context
+
+    def _is_healthy(self, context: BrowserContext) -> bool:
+        """Whether the context's browser process is the one it was created on."""
+        info = self._info.get(context)
+        return info is not None and info.shard.alive and info.shard.generation == info.generation
+
+    async def _close_context(self, context: BrowserContext):
+        info = self._info.pop(context, None)
+        if info and info.shard.generation == info.generation:
+            info.shard.contexts -= 1
+        try:
+            # A hung renderer must not hang the caller too
+            await asyncio.wait_for(context.close(), timeout=CONTEXT_CLOSE_TIMEOUT)
+        except Exception:
+            pass
+
+    def _pick_idle(self, site: str | None) -> BrowserContext:
+        """Take the most recent idle context holding the site's session, else the most recent."""
+        index = len(self._idle) - 1
+        if site and settings.session_affinity:
+            for i in range(len(self._idle) - 1, -1, -1):
+                if site in self._info[self._idle[i][0]].sites:
+                    index = i
+                    break
+        context, _ = self._idle[index]
+        del self._idle[index]
+        return context
+
+    async def _acquire(self, site: str | None = None) -> BrowserContext:
+        """Take an idle context, create one below the max, or wait for a release."""
+        if self._idle:
+            # Most recently used first, so the oldest idle ones can be reaped
+            context = self._pick_idle(site)
+        elif self._total < self._max:
+            self._total += 1
+            try:
+                context = await self._create_context()
+            except Exception:
+                self._total -= 1
+                raise
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            started = time.monotonic()
+            try:
+                context = await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Handed a context just as we were cancelled, pass it on
+                    self._in_use += 1
+                    self._release(waiter.result())
+                else:
+                    self._waiters.remove(waiter)
+                raise
+            wait_ms = int((time.monotonic() - started) * 1000)
+            self.stats["waited"] += 1
+            self.stats["wait_ms_total"] += wait_ms
+            self.stats["wait_ms_max"] = max(self.stats["wait_ms_max"], wait_ms)
+
+        self._in_use += 1
+        self.stats["acquired"] += 1
+        return context
+
+    def _release(self, context: BrowserContext):
+        """Hand a context to the next waiter or put it back as idle."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use -= 1
+                waiter.set_result(context)
+                return
+        self._in_use -= 1
+        self._idle.append((context, time.monotonic()))
+
+    async def _discard(self, context: BrowserContext):
+        """Close a broken context and free its slot."""
+        self._in_use -= 1
+        self._total -= 1
+        await self._close_context(context)
+
+        # A waiter may be blocked on the slot we just freed
+        if self._waiters and self._total < self._max:
+            asyncio.create_task(self._grow(1))
+
+    def _recycle_reason(self, context: BrowserContext, heap_mb: float | None) -> str | None:
+        """Why a healthy context should be rotated out, if it should."""
+        info = self._info[context]
+        if info.pages >= settings.context_max_pages:
+            return "pages"
+        if time.monotonic() - info.created_at >= settings.context_max_age_seconds:
+            return "age"
+        if heap_mb is not None and heap_mb >= settings.context_max_heap_mb:
+            return "heap"
+        return None
+
+    async def _heap_mb(self, context: BrowserContext, page: Page) -> float | None:
+        """Renderer JS heap in use, read through CDP. None if unavailable."""
+        try:
+            session = await context.new_cdp_session(page)
+            try:
+                usage = await session.send("Runtime.getHeapUsage")
+            finally:
+                await session.detach()
+            return usage["usedSize"] / (1024 * 1024)
+        except Exception:
+            return None
+
+    async def _recycle(self, context: BrowserContext, reason: str):
+        """Replace a context with a spare (or a fresh one) and close it."""
+        self.stats[f"recycled_{reason}"] += 1
+        logger.info(f"Recycling browser context ({reason})")
+
+        spare = None
+        while self._spares:
+            candidate = self._spares.popleft()
+            if self._is_healthy(candidate):
+                spare = candidate
+                break
+            asyncio.create_task(self._close_context(candidate))
+
+        if spare:
+            # The spare takes over the slot, nobody waits for a new context
+            self._release(spare)
+        else:
+            self._in_use -= 1
+            self._total -= 1
+            asyncio.create_task(self._grow(1))
+
+        asyncio.create_task(self._close_context(context))
+        asyncio.create_task(self._fill_spares())
+
+    async def _fill_spares(self):
+        """Pre-create spare contexts used to replace recycled ones."""
+        if self._filling_spares:
+            return
+        self._filling_spares = True
+        try:
+            while len(self._spares) < settings.context_spares and not self._stopping:
+                try:
+                    self._spares.append(await self._create_context())
+                except Exception as e:
+                    logger.error(f"Failed to create spare browser context: {e}")
+                    return
+        finally:
+            self._filling_spares = False
+
+    async def _grow(self, count: int):
+        """Create contexts in the background and hand them out."""
+        for _ in range(count):
+            if self._total >= self._max:
+                return
+            self._total += 1
+            try:
+                context = await self._create_context()
+            except Exception as e:
+                self._total -= 1
+                logger.error(f"Failed to create browser context: {e}")
+                return
+            self._in_use += 1  # _release accounts it back
+            self._release(context)
+
+    async def _scale_loop(self):
+        """Grow with queue depth, reap contexts idle for too long."""
+        from app.core.manager import manager
+
+        while True:
+            await asyncio.sleep(1)
+            try:
+                # Grow: jobs queued (or workers waiting) beyond what idle contexts cover.
+                # In supervisor mode the queue's jobs run in the worker processes,
+                # whose own queues stay empty: only this pool's waiters count
+                backlog = 0 if settings.worker_processes else manager.queue.qsize()
+                demand = backlog + len(self._waiters) - len(self._idle)
+                deficit = min(demand, self._max - self._total)
+                if deficit > 0:
+                    logger.info(f"Growing browser pool by {deficit} contexts")
+                    await self._grow(deficit)
+
+                # Reap: oldest idle contexts first, never below the minimum
+                now = time.monotonic()
+                while (
+                    self._idle
+                    and self._total > self._min
+                    and now - self._idle[0][1] > settings.browser_pool_idle_seconds
+                ):
+                    context, _ = self._idle.popleft()
+                    self._total -= 1
+                    self.stats["reaped"] += 1
+                    await self._close_context(context)
+            except Exception as e:
+                logger.error(f"Browser pool scaler error: {e}")
+
+    def metrics(self) -> dict[str, int]:
+        """Live pool metrics for the stats endpoint."""
+        pages = self.stats["pages_created"] + self.stats["pages_reused"]
+        return {
+            "min": self._min,
+            "max": self._max,
+            "total": self._total,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "waiters": len(self._waiters),
+            "processes": len(self.shards),
+            "processes_alive": sum(1 for shard in self.shards if shard.alive),
+            "spares": len(self._spares),
+            "page_reuse_pct": int(100 * self.stats["pages_reused"] / pages) if pages else 0,
+            **self.stats,
+        }
+
+    def _session_path(self, site: str) -> Path:
+        filename = re.sub(r"[^\w.-]", "_", site)
+        return Path(settings.session_dir) / f"{filename}.json"
+
+    async def _load_session(self, site: str) -> dict | None:
+        """Storage state of a site, from memory or disk."""
+        if site in self._sessions:
+            return self._sessions[site]
+        path = self._session_path(site)
+        try:
+            state = json.loads(await asyncio.to_thread(path.read_text))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read session for {site}: {e}")
+            return None
+        self._sessions[site] = state
+        return state
+
+    async def _save_session(self, context: BrowserContext, site: str, force: bool = False):
+        """Persist a site's cookies and localStorage, at most every session_save_seconds."""
+        now = time.monotonic()
+        if not force and now - self._sessions_saved_at.get(site, 0) < settings.session_save_seconds:
+            return
+        self._sessions_saved_at[site] = now
+
+        try:
+            state = await context.storage_state()
+            state = {
+                "cookies": [
+                    c for c in state["cookies"] if _site_of(c["domain"].lstrip(".")) == site
+                ],
+                "origins": [
+                    {
+                        **o,
+                        "localStorage": [
+                            item
+                            for item in o.get("localStorage", [])
+                            if item["name"] != RESTORED_MARKER
+                        ],
+                    }
+                    for o in state["origins"]
+                    if _site_of(urlparse(o["origin"]).hostname or "") == site
+                ],
+            }
+            self._sessions[site] = state
+            path = self._session_path(site)
+            await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+            await asyncio.to_thread(path.write_text, json.dumps(state))
+            self.stats["sessions_saved"] += 1
+        except Exception as e:
+            logger.warning(f"Could not save session for {site}: {e}")
+
+    async def _prepare_session(self, context: BrowserContext, site: str):
+        """Make sure the context holds the site's session, restoring it if needed."""
+        info = self._info[context]
+        if site in info.sites:
+            self.stats["affinity_hits"] += 1
+            return
+
+        self.stats["affinity_misses"] += 1
+        info.sites.add(site)
+        state = await self._load_session(site)
+        if not state:
+            return
+
+        if state.get("cookies"):
+            await context.add_cookies(state["cookies"])
+        for origin in state.get("origins", []):
+            # Init scripts can't be removed: one per origin for the context's lifetime
+            if origin.get("localStorage") and origin["origin"] not in info.restore_scripts:
+                info.restore_scripts.add(origin["origin"])
+                await context.add_init_script(
+                    script=RESTORE_LOCAL_STORAGE_JS
+                    % (
+                        json.dumps(origin["origin"]),
+                        json.dumps(origin["localStorage"]),
+                        json.dumps(RESTORED_MARKER),
+                    )
+                )
+        self.stats["sessions_restored"] += 1
+
+    async def _apply_blocking(self, page: Page, profile_name: str) -> RequestBlocker | None:
+        """Install request routing for a blocking profile on a page."""
+        profile = BLOCKING_PROFILES.get(profile_name)
+        if profile is None:
+            logger.warning(f"Unknown blocking profile '{profile_name}', not blocking")
+            return None
+        if not profile:
+            return None
+
+        stats = self.blocking_stats.setdefault(
+            profile_name,
+            {"allowed_requests": 0, "blocked_requests": 0, "allowed_bytes": 0},
         )
+        blocker = RequestBlocker(profile, stats)
+        await page.route("**/*", blocker.handle)
+        page.on("response", blocker.on_response)
+        return blocker
+
+    async def _take_page(self, context: BrowserContext) -> Page:
+        """The context's warm page if it has one, otherwise a new page."""
+        info = self._info[context]
+        page, info.page = info.page, None
+        if page and not page.is_closed():
+            self.stats["pages_reused"] += 1
+            return page
+
+        self.stats["pages_created"] += 1
+        return await context.new_page()
+
+    async def _park_page(self, context: BrowserContext, page: Page, blocker: RequestBlocker | None):
+        """Reset a page and keep it warm on its context; close it if the reset fails."""
+        started = time.monotonic()
+        try:
+            if blocker:
+                page.remove_listener("response", blocker.on_response)
+            await asyncio.wait_for(self._reset_page(page), timeout=PAGE_RESET_TIMEOUT)
+            self._info[context].page = page
+        except Exception as e:
+            logger.warning(f"Page reset failed, page will be replaced: {e}")
+            self.stats["page_reset_failures"] += 1
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self.stats["page_resets"] += 1
+        self.stats["page_reset_ms_total"] += int((time.monotonic() - started) * 1000)
+
+    async def _reset_page(self, page: Page):
+        """Clear routes (and optionally storage), then park the page on about:blank."""
+        await page.unroute_all(behavior="ignoreErrors")
+        if settings.page_reset_clear_storage:
+            await page.evaluate(CLEAR_STORAGE_JS)
+            await page.context.clear_cookies()
+            # The context no longer holds any session: affinity must not route to it
+            info = self._info.get(page.context)
+            if info:
+                info.sites.clear()
+        await page.goto("about:blank")
 
     @asynccontextmanager
-    async def get_page(self) -> Page:
-        """Get a page from the pool. Returns page to pool when done."""
+    async def get_page(self, blocking: str | None = None, domain: str | None = None) -> Page:
+        """
+        Get a page from the pool. Returns page to pool when done.
+
+        Args:
+            blocking: Name of a BLOCKING_PROFILES entry to route the page through
+            domain: Host the page will visit, used for session affinity
+
+        Raises:
+            BrowserCrashedError: The page's browser process died during use
+        """
         if not self._initialized:
-            raise RuntimeError("Browser pool not initialized")
+            if not (settings.browser_lazy_start or settings.worker_processes):
+                raise RuntimeError("Browser pool not initialized")
+            # Lazy mode (and the API process in supervisor mode, for template
+            # tests): the first use pays for the browser launch
+            await self.start()
+
+        site = _site_of(domain) if domain and settings.session_affinity else None
 
         # Get context from pool
-        context = await self.contexts.get()
+        context = await self._acquire(site)
+        page = None
+        blocker = None
+        abandoned = False
 
         try:
-            # Create new page
-            page = await context.new_page()
+            if site:
+                await self._prepare_session(context, site)
+
+            # Reuse the context's warm page, or create one
+            page = await self._take_page(context)
+            blocker = await self._apply_blocking(page, blocking or settings.blocking_profile)
             yield page
+            if not self._is_healthy(context):
+                # The browser died under a body that swallowed the errors (e.g.
+                # per-field extraction): its result is not trustworthy
+                raise BrowserCrashedError("Browser process crashed during the job")
+        except asyncio.CancelledError:
+            # Job cancelled or past its deadline: the page may be hung, so the
+            # whole context is killed rather than reused
+            abandoned = True
+            self.stats["abandoned"] += 1
+            raise
+        except Exception as e:
+            if not self._is_healthy(context) and not isinstance(e, BrowserCrashedError):
+                raise BrowserCrashedError(f"Browser process crashed: {e}") from e
+            raise
         finally:
-            # Close page
-            try:
-                await page.close()
-            except Exception:
-                pass
+            healthy = not abandoned and self._is_healthy(context)
+            heap_mb = None
+            if healthy:
+                info = self._info[context]
+                info.pages += 1
+                if page and settings.context_max_heap_mb and info.pages % HEAP_CHECK_EVERY == 0:
+                    heap_mb = await self._heap_mb(context, page)
 
-            # Return context to pool (or create new one if broken)
-            try:
-                # Test if context is still valid
-                await context.pages()
-                await self.contexts.put(context)
-            except Exception:
-                # Context is broken, create new one
+            reason = self._recycle_reason(context, heap_mb) if healthy else None
+            if site and healthy:
+                await self._save_session(context, site, force=reason is not None)
+
+            # Keep the page warm for the next job, or close it
+            if page and healthy and not reason and settings.page_reuse and not page.is_closed():
+                await self._park_page(context, page, blocker)
+            elif page and not abandoned:
                 try:
-                    await context.close()
+                    await page.close()
                 except Exception:
                     pass
-                new_context = await self._create_context()
-                await self.contexts.put(new_context)
+
+            # Return context to pool, rotate it, or drop it if broken
+            if not healthy:
+                await self._discard(context)
+            elif reason:
+                await self._recycle(context, reason)
+            else:
+                self._release(context)
 
 
 # Global browser pool instance
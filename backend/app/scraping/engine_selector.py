@@ -0,0 +1,83 @@
+import logging
+import time
+from fnmatch import fnmatch
+from typing import Any
+from urllib.parse import urlparse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def has_required_fields(data: dict[str, Any], selectors: list[dict]) -> bool:
+    """Check that required fields (or the first field, if none) are non-empty."""
+    required = [s["name"] for s in selectors if s.get("required") and s.get("name")]
+    if not required and selectors and selectors[0].get("name"):
+        required = [selectors[0]["name"]]
+    return all(data.get(name) not in (None, "", []) for name in required)
+
+
+class EngineSelector:
+    """
+    Learns which engine works for each template and URL pattern.
+
+    Used by engine=auto: static HTTP extraction is tried first and the
+    browser is used when required fields come back empty. The outcome is
+    remembered per (template, url_pattern) so later jobs skip the probe,
+    and templates stuck on the browser are re-probed periodically.
+    """
+
+    def __init__(self):
+        self.decisions: dict[tuple, dict[str, Any]] = {}
+
+    @staticmethod
+    def key(template_id: int | None, url_pattern: str | None, url: str) -> tuple:
+        """Group URLs by the template's url_pattern, or by host when it doesn't match."""
+        if url_pattern and fnmatch(url, url_pattern):
+            return (template_id, url_pattern)
+        return (template_id, urlparse(url).hostname or "")
+
+    def choose(self, key: tuple) -> str:
+        """Return the engine to try first for this key: http or browser."""
+        decision = self.decisions.get(key)
+        if decision is None or decision["engine"] == "http":
+            return "http"
+
+        decision["jobs_since_probe"] += 1
+        due = (
+            decision["jobs_since_probe"] >= settings.engine_reprobe_every
+            or time.monotonic() - decision["probed_at"] >= settings.engine_reprobe_seconds
+        )
+        if due:
+            logger.info(f"Re-probing static engine for {key}")
+            return "http"
+        return "browser"
+
+    def record(self, key: tuple, http_ok: bool):
+        """Store the outcome of a static extraction attempt."""
+        engine = "http" if http_ok else "browser"
+        previous = self.decisions.get(key)
+        if not previous or previous["engine"] != engine:
+            logger.info(f"Engine for {key} set to {engine}")
+
+        self.decisions[key] = {
+            "engine": engine,
+            "jobs_since_probe": 0,
+            "probed_at": time.monotonic(),
+        }
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Current decisions, for the stats endpoint."""
+        return [
+            {
+                "template_id": key[0],
+                "pattern": key[1],
+                "engine": decision["engine"],
+                "jobs_since_probe": decision["jobs_since_probe"],
+            }
+            for key, decision in self.decisions.items()
+        ]
+
+
+# Global engine selector instance
+engine_selector = EngineSelector()
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.scraping.browser import BrowserCrashedError
+
+
+class HttpStatusError(RuntimeError):
+    """The target answered with an error status (4xx/5xx)."""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+
+
+class SelectorMissingError(RuntimeError):
+    """Fields marked required came back empty."""
+
+    def __init__(self, fields: list[str]):
+        super().__init__(f"Required fields missing: {', '.join(fields)}")
+        self.fields = fields
+
+
+def classify(exc: BaseException) -> tuple[str, int | None]:
+    """
+    Sort a scrape failure into a class used by the retry policy.
+
+    Returns:
+        (error_type, http_status) where error_type is one of network, timeout,
+        http_status, selector_missing, browser_crash or other
+    """
+    if isinstance(exc, HttpStatusError):
+        return "http_status", exc.status
+    if isinstance(exc, httpx.HTTPStatusError):
+        return "http_status", exc.response.status_code
+    if isinstance(exc, SelectorMissingError):
+        return "selector_missing", None
+    if isinstance(exc, BrowserCrashedError):
+        return "browser_crash", None
+    if isinstance(exc, (PlaywrightTimeoutError, httpx.TimeoutException, asyncio.TimeoutError)):
+        return "timeout", None
+    if isinstance(exc, httpx.TransportError):
+        return "network", None
+    if isinstance(exc, PlaywrightError):
+        message = str(exc)
+        if "net::ERR_" in message or "NS_ERROR_" in message:
+            return "network", None
+        if "Target page, context or browser has been closed" in message:
+            return "browser_crash", None
+    return "other", None
@@ -1,16 +1,97 @@
+import asyncio
 import logging
+from collections import deque
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
+from urllib.parse import urldefrag, urlparse
 
+from app.config import settings
 from app.scraping.browser import browser_pool
+from app.scraping.engine_selector import engine_selector, has_required_fields
+from app.scraping.errors import HttpStatusError, classify
+from app.scraping.readiness import PageReadiness
 
 logger = logging.getLogger(__name__)
 
+# In-page extraction script: resolves every field in a single round trip.
+# Errors are caught per field so one bad selector doesn't void the others.
+EXTRACT_FIELDS_JS = """
+(fields) => {
+    const data = {};
+    const errors = {};
+    const textOf = (el) => {
+        const text = el.innerText;
+        return text ? text.trim() : null;
+    };
+    for (const field of fields) {
+        try {
+            if (field.type === "list") {
+                data[field.name] = Array.from(document.querySelectorAll(field.selector), textOf);
+                continue;
+            }
+            const el = document.querySelector(field.selector);
+            if (!el) {
+                data[field.name] = null;
+            } else if (field.type === "text") {
+                data[field.name] = textOf(el);
+            } else if (field.type === "html") {
+                data[field.name] = el.innerHTML;
+            } else if (field.type === "attribute") {
+                data[field.name] = field.attribute ? el.getAttribute(field.attribute) : null;
+            } else {
+                data[field.name] = null;
+            }
+        } catch (e) {
+            data[field.name] = null;
+            errors[field.name] = String((e && e.message) || e);
+        }
+    }
+    return { data, errors };
+}
+"""
+
+# Absolute hrefs of pagination and follow links, for crawl mode
+COLLECT_LINKS_JS = """
+({ next, follow }) => {
+    const hrefs = (selector) => {
+        if (!selector) return [];
+        try {
+            return Array.from(document.querySelectorAll(selector), (el) => el.href).filter(Boolean);
+        } catch (e) {
+            return [];
+        }
+    };
+    return { next: hrefs(next), follow: hrefs(follow) };
+}
+"""
+
+
+def normalize_fields(selectors: list[dict]) -> list[dict]:
+    """Selector definitions with defaults applied, skipping incomplete ones."""
+    return [
+        {
+            "name": s.get("name"),
+            "selector": s.get("selector"),
+            "type": s.get("type", "text"),
+            "attribute": s.get("attribute"),
+        }
+        for s in selectors
+        if s.get("name") and s.get("selector")
+    ]
+
 
 class TemplateExecutor:
     """Executes scraping templates using Playwright."""
 
-    async def execute(self, url: str, selectors: list[dict]) -> dict[str, Any]:
+    async def execute(
+        self,
+        url: str,
+        selectors: list[dict],
+        config: dict | None = None,
+        template_id: int | None = None,
+        url_pattern: str | None = None,
+    ) -> dict[str, Any]:
         """
         Execute a template on a URL.
 
@@ -21,64 +102,41 @@ class TemplateExecutor:
                 - selector: CSS selector
                 - type: text, html, attribute, list
                 - attribute: Attribute name if type=attribute
+            config: Template config. `engine` selects "browser" (default),
+                "http" (static fetch, no JS) or "auto" (static first, browser
+                when required fields are empty). `extraction` selects "batch" (single
+                page.evaluate for all fields) or "per_field" extraction;
+                `readiness` configures the page-readiness wait and
+                `blocking` names a request-blocking profile.
+            template_id: Template ID, used by engine=auto to learn per template
+            url_pattern: Template URL pattern, used by engine=auto
 
         Returns:
             dict with:
                 - data: Extracted data
                 - duration_ms: Execution time in milliseconds
+                - readiness: Strategy and condition that ended the wait
         """
+        config = config or {}
+        engine = config.get("engine", "browser")
+        if engine == "http":
+            from app.scraping.http_engine import http_executor
+
+            return await http_executor.execute(url, selectors)
+
+        if engine == "auto":
+            result = await self._try_static(url, selectors, template_id, url_pattern)
+            if result is not None:
+                return result
+
         start_time = datetime.now()
         logger.info(f"Starting scrape of {url} with {len(selectors)} selectors")
 
-        async with browser_pool.get_page() as page:
-            # Navigate to URL - use domcontentloaded for faster loading
-            # networkidle can timeout on sites with continuous requests (ads, analytics)
-            logger.info(f"Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            # Wait for dynamic content to load
-            await page.wait_for_timeout(3000)
-
-            # Try to wait for the first selector to appear
-            if selectors:
-                first_selector = selectors[0].get("selector")
-                if first_selector:
-                    logger.info(f"Waiting for first selector: {first_selector}")
-                    try:
-                        await page.wait_for_selector(first_selector, timeout=10000)
-                        logger.info("First selector found!")
-                    except Exception as e:
-                        logger.warning(f"First selector not found after 10s: {e}")
-                        # Take screenshot for debugging
-                        try:
-                            screenshot = await page.screenshot()
-                            logger.info(f"Page title: {await page.title()}")
-                            logger.info(f"Page URL: {page.url}")
-                        except:
-                            pass
-
-            # Extract data based on selectors
-            data = {}
-            for selector_def in selectors:
-                name = selector_def.get("name")
-                selector = selector_def.get("selector")
-                selector_type = selector_def.get("type", "text")
-                attribute = selector_def.get("attribute")
-
-                if not name or not selector:
-                    continue
-
-                logger.info(f"Extracting '{name}' with selector: {selector}")
-
-                try:
-                    value = await self._extract_value(
-                        page, selector, selector_type, attribute
-                    )
-                    logger.info(f"  Result for '{name}': {value[:100] if isinstance(value, str) and len(value) > 100 else value}")
-                    data[name] = value
-                except Exception as e:
-                    logger.warning(f"Failed to extract '{name}': {e}")
-                    data[name] = None
+        async with browser_pool.get_page(
+            blocking=config.get("blocking"),
+            domain=urlparse(url).hostname,
+        ) as page:
+            data, ready = await self._scrape_page(page, url, selectors, config)
 
         duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         logger.info(f"Scrape completed in {duration_ms}ms")
@@ -86,8 +144,288 @@ class TemplateExecutor:
         return {
             "data": data,
             "duration_ms": duration_ms,
+            "readiness": ready,
+            "engine": "browser",
         }
 
+    async def crawl(
+        self,
+        url: str,
+        selectors: list[dict],
+        config: dict,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Crawl from a start URL, yielding each page's extraction as it completes.
+
+        Configured by `config.crawl`:
+            - next_selector: Pagination link ("next page"), followed at the same depth
+            - follow_selector: Links followed one level deeper
+            - max_pages: Maximum pages visited (default 50)
+            - max_depth: Maximum depth for follow_selector links (default 1)
+            - same_domain: Only follow links on the start URL's host (default true)
+
+        One pooled page is reused for the whole crawl, always on the browser engine.
+
+        Yields:
+            dict with url, depth, data, duration_ms, readiness, error and error_type
+        """
+        options = config.get("crawl") or {}
+        next_selector = options.get("next_selector")
+        follow_selector = options.get("follow_selector")
+        max_pages = int(options.get("max_pages", 50))
+        max_depth = int(options.get("max_depth", 1))
+        same_domain = options.get("same_domain", True)
+        start_host = urlparse(url).hostname
+
+        frontier: deque[tuple[str, int]] = deque([(url, 0)])
+        seen = {urldefrag(url).url}
+        visited = 0
+
+        async with browser_pool.get_page(
+            blocking=config.get("blocking"),
+            domain=start_host,
+        ) as page:
+            while frontier and visited < max_pages:
+                page_url, depth = frontier.popleft()
+                visited += 1
+                start_time = datetime.now()
+                logger.info(f"Crawling {page_url} (page {visited}, depth {depth})")
+
+                try:
+                    data, ready = await self._scrape_page(page, page_url, selectors, config)
+                    links = await page.evaluate(
+                        COLLECT_LINKS_JS,
+                        {"next": next_selector, "follow": follow_selector},
+                    )
+                    error = error_type = None
+                except Exception as e:
+                    if page.is_closed():
+                        # Page (or its browser) is gone, the crawl can't go on
+                        raise
+                    logger.warning(f"Crawl of {page_url} failed: {e}")
+                    data, ready, links, error = None, None, {"next": [], "follow": []}, str(e)
+                    error_type = classify(e)[0]
+
+                candidates = [(link, depth) for link in links["next"]]
+                if depth < max_depth:
+                    candidates += [(link, depth + 1) for link in links["follow"]]
+                for link, link_depth in candidates:
+                    link = urldefrag(link).url
+                    if link in seen or not link.startswith(("http://", "https://")):
+                        continue
+                    if same_domain and urlparse(link).hostname != start_host:
+                        continue
+                    seen.add(link)
+                    frontier.append((link, link_depth))
+
+                yield {
+                    "url": page_url,
+                    "depth": depth,
+                    "data": data,
+                    "duration_ms": int((datetime.now() - start_time).total_seconds() * 1000),
+                    "readiness": ready,
+                    "error": error,
+                    "error_type": error_type,
+                }
+
+        logger.info(f"Crawl from {url} finished after {visited} pages")
+
+    async def _scrape_page(
+        self,
+        page,
+        url: str,
+        selectors: list[dict],
+        config: dict,
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Navigate a pooled page, wait for readiness and extract. Returns (data, readiness)."""
+        readiness = PageReadiness(selectors, config)
+
+        # Navigate to URL - use domcontentloaded for faster loading
+        # networkidle can timeout on sites with continuous requests (ads, analytics)
+        logger.info(f"Navigating to {url}")
+        readiness.attach(page)
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            if response and response.status >= 400:
+                raise HttpStatusError(response.status, url)
+
+            # Wait for dynamic content according to the template's readiness strategy
+            ready = await readiness.wait(page)
+        finally:
+            readiness.detach()
+
+        # Extract data based on selectors
+        mode = config.get("extraction", settings.extraction_mode)
+        data = await self.extract(page, selectors, mode=mode)
+        return data, ready
+
+    async def execute_many(
+        self,
+        urls: list[str],
+        selectors: list[dict],
+        config: dict | None = None,
+        template_id: int | None = None,
+        url_pattern: str | None = None,
+        concurrency: int | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Execute a template on many URLs, pipelining navigations across pooled pages.
+
+        Up to `concurrency` (default BROWSER_POOL_SIZE) lanes each keep one
+        pooled page checked out for the whole run and pull the next URL as
+        soon as their page is free, so one page navigates while the others
+        wait for readiness or extract, without a pool round trip (and page
+        reset) per URL. A lane whose page dies takes a fresh one and goes on.
+        The http engine (and engine=auto, static first) runs without pages.
+
+        Returns:
+            Results in input order, as execute() returns them; a URL that
+            failed yields its exception instead
+        """
+        config = config or {}
+        engine = config.get("engine", "browser")
+        results: list[dict[str, Any] | Exception | None] = [None] * len(urls)
+        pending = deque(range(len(urls)))
+        lanes = min(concurrency or settings.browser_pool_size, len(urls))
+
+        async def static_lane():
+            while pending:
+                index = pending.popleft()
+                try:
+                    results[index] = await self.execute(
+                        urls[index], selectors, config, template_id, url_pattern
+                    )
+                except Exception as e:
+                    results[index] = e
+
+        async def browser_lane():
+            while pending:
+                taken = 0
+                try:
+                    async with browser_pool.get_page(
+                        blocking=config.get("blocking"),
+                        domain=urlparse(urls[pending[0]]).hostname,
+                    ) as page:
+                        while pending and not page.is_closed():
+                            index = pending.popleft()
+                            taken += 1
+                            results[index] = await scrape(page, urls[index])
+                except Exception as e:
+                    # The page's browser died (its URL already holds the error)
+                    logger.warning(f"Pipelined page lost, taking a fresh one: {e}")
+                    if not taken and pending:
+                        # No page could be had at all: fail a URL so the lane moves on
+                        results[pending.popleft()] = e
+
+        async def scrape(page, url: str) -> dict[str, Any] | Exception:
+            start_time = datetime.now()
+            try:
+                if engine == "auto":
+                    static = await self._try_static(url, selectors, template_id, url_pattern)
+                    if static is not None:
+                        return static
+                data, ready = await self._scrape_page(page, url, selectors, config)
+            except Exception as e:
+                return e
+            return {
+                "data": data,
+                "duration_ms": int((datetime.now() - start_time).total_seconds() * 1000),
+                "readiness": ready,
+                "engine": "browser",
+            }
+
+        lane = static_lane if engine == "http" else browser_lane
+        logger.info(f"Executing template on {len(urls)} URLs over {lanes} lanes")
+        await asyncio.gather(*(lane() for _ in range(lanes)))
+        return results
+
+    async def _try_static(
+        self,
+        url: str,
+        selectors: list[dict],
+        template_id: int | None,
+        url_pattern: str | None,
+    ) -> dict[str, Any] | None:
+        """Static extraction for engine=auto. Returns None when the browser is needed."""
+        from app.scraping.http_engine import http_executor
+
+        key = engine_selector.key(template_id, url_pattern, url)
+        if engine_selector.choose(key) != "http":
+            return None
+
+        try:
+            result = await http_executor.execute(url, selectors)
+            ok = has_required_fields(result["data"], selectors)
+        except Exception as e:
+            logger.info(f"Static extraction of {url} failed: {e}")
+            result, ok = None, False
+
+        engine_selector.record(key, ok)
+        if not ok:
+            logger.info(f"Escalating {url} to the browser engine")
+            return None
+        return result
+
+    async def extract(
+        self,
+        page,
+        selectors: list[dict],
+        mode: str = "batch",
+    ) -> dict[str, Any]:
+        """Extract all selector fields from an already loaded page."""
+        fields = normalize_fields(selectors)
+
+        if mode == "per_field":
+            return await self._extract_per_field(page, fields)
+
+        # Playwright pseudo-selectors (:has-text) are not valid CSS in the page,
+        # so those fields still go through the locator API
+        in_page = [f for f in fields if ":has-text(" not in f["selector"]]
+        batch = {"data": {}, "errors": {}}
+        if in_page:
+            logger.info(f"Extracting {len(in_page)} fields in a single evaluate")
+            try:
+                batch = await page.evaluate(EXTRACT_FIELDS_JS, in_page)
+            except Exception as e:
+                if page.is_closed():
+                    raise
+                # Script could not run at all (e.g. navigation in progress)
+                logger.warning(f"Batch extraction failed, falling back to per-field: {e}")
+                return await self._extract_per_field(page, fields)
+
+        data = {}
+        for field in fields:
+            name = field["name"]
+            if name in batch["data"]:
+                if name in batch["errors"]:
+                    logger.warning(f"Failed to extract '{name}': {batch['errors'][name]}")
+                data[name] = batch["data"][name]
+            else:
+                data.update(await self._extract_per_field(page, [field]))
+        return data
+
+    async def _extract_per_field(self, page, fields: list[dict]) -> dict[str, Any]:
+        """Extract fields one by one, one Playwright round trip per selector."""
+        data = {}
+        for field in fields:
+            name = field["name"]
+            selector = field["selector"]
+            logger.info(f"Extracting '{name}' with selector: {selector}")
+
+            try:
+                value = await self._extract_value(
+                    page, selector, field["type"], field["attribute"]
+                )
+                logger.info(f"  Result for '{name}': {value[:100] if isinstance(value, str) and len(value) > 100 else value}")
+                data[name] = value
+            except Exception as e:
+                if page.is_closed():
+                    # Page or browser gone: nothing else can be extracted
+                    raise
+                logger.warning(f"Failed to extract '{name}': {e}")
+                data[name] = None
+        return data
+
     async def _extract_value(
         self,
         page,
@@ -0,0 +1,150 @@
+import asyncio
+import html
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+import httpx
+import lxml.html
+from lxml.cssselect import CSSSelector
+
+from app.config import settings
+from app.scraping.browser import USER_AGENT
+from app.scraping.executor import normalize_fields
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1024)
+def _compile(selector: str) -> CSSSelector:
+    """Compile a CSS selector to XPath once per process."""
+    return CSSSelector(selector)
+
+
+def _text(el) -> str | None:
+    text = el.text_content()
+    return text.strip() if text else None
+
+
+def _inner_html(el) -> str:
+    parts = [html.escape(el.text, quote=False)] if el.text else []
+    parts.extend(lxml.html.tostring(child, encoding="unicode") for child in el)
+    return "".join(parts)
+
+
+def parse_fields(
+    document: bytes,
+    fields: list[dict],
+    encoding: str | None = None,
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """
+    Apply selector fields to an HTML document.
+
+    Same semantics as the in-page extraction: missing elements yield None and
+    errors are caught per field. The document is parsed from bytes (lxml
+    rejects str with an XML encoding declaration); encoding is the charset
+    from the Content-Type header, if any, otherwise lxml detects it.
+
+    Returns:
+        (data, errors) where errors maps field name to error message
+    """
+    data: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    root = (
+        lxml.html.fromstring(document, parser=lxml.html.HTMLParser(encoding=encoding))
+        if document.strip()
+        else None
+    )
+
+    for field in fields:
+        name = field["name"]
+        try:
+            if root is None:
+                data[name] = [] if field["type"] == "list" else None
+                continue
+
+            elements = _compile(field["selector"])(root)
+            if field["type"] == "list":
+                data[name] = [_text(el) for el in elements]
+                continue
+
+            el = elements[0] if elements else None
+            if el is None:
+                data[name] = None
+            elif field["type"] == "text":
+                data[name] = _text(el)
+            elif field["type"] == "html":
+                data[name] = _inner_html(el)
+            elif field["type"] == "attribute":
+                data[name] = el.get(field["attribute"]) if field["attribute"] else None
+            else:
+                data[name] = None
+        except Exception as e:
+            data[name] = None
+            errors[name] = str(e)
+
+    return data, errors
+
+
+class HttpExecutor:
+    """Executes scraping templates over plain HTTP, without a browser."""
+
+    def __init__(self):
+        self.client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client so connections are pooled across jobs."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=settings.http_timeout_seconds,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_connections,
+                ),
+            )
+        return self.client
+
+    async def stop(self):
+        """Close pooled connections."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("HTTP client closed")
+
+    async def execute(self, url: str, selectors: list[dict]) -> dict[str, Any]:
+        """
+        Fetch a URL and extract selector fields from the static HTML.
+
+        Returns:
+            dict with data and duration_ms, like TemplateExecutor.execute
+        """
+        start_time = datetime.now()
+        logger.info(f"Fetching {url} over HTTP with {len(selectors)} selectors")
+
+        response = await self._get_client().get(url)
+        response.raise_for_status()
+
+        fields = normalize_fields(selectors)
+
+        # Parsing is CPU bound, keep it off the event loop
+        data, errors = await asyncio.to_thread(
+            parse_fields, response.content, fields, response.charset_encoding
+        )
+        for name, error in errors.items():
+            logger.warning(f"Failed to extract '{name}': {error}")
+
+        duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        logger.info(f"HTTP scrape completed in {duration_ms}ms")
+
+        return {
+            "data": data,
+            "duration_ms": duration_ms,
+            "engine": "http",
+        }
+
+
+# Global HTTP executor instance
+http_executor = HttpExecutor()
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("selectors", "mutation_quiet", "network_idle", "delay")
+
+# Resolves once the DOM has had no mutations for quietMs, or at timeoutMs
+MUTATION_QUIET_JS = """
+({ quietMs, timeoutMs }) => new Promise((resolve) => {
+    let quietTimer = null;
+    let deadlineTimer = null;
+    let observer = null;
+    const done = (reason) => {
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadlineTimer);
+        resolve(reason);
+    };
+    observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done("quiet"), quietMs);
+    });
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+    });
+    quietTimer = setTimeout(() => done("quiet"), quietMs);
+    deadlineTimer = setTimeout(() => done("deadline"), timeoutMs);
+})
+"""
+
+
+class PageReadiness:
+    """
+    Decides when a page is ready for extraction.
+
+    Configured per template through `config.readiness`:
+        - strategy: selectors, mutation_quiet, network_idle or delay
+        - timeout_ms: Overall deadline budget for the wait
+        - quiet_ms: Quiet window for mutation_quiet / network_idle
+        - delay_ms: Fixed wait for the delay strategy
+        - ignore: URL substrings ignored by network_idle (ads, analytics)
+
+    Usage: attach() before navigation, wait() after it, detach() when done.
+    """
+
+    def __init__(self, selectors: list[dict], config: dict | None = None):
+        options = (config or {}).get("readiness") or {}
+        self.strategy = options.get("strategy", settings.readiness_strategy)
+        if self.strategy not in STRATEGIES:
+            logger.warning(f"Unknown readiness strategy '{self.strategy}', using selectors")
+            self.strategy = "selectors"
+        self.timeout_ms = int(options.get("timeout_ms", settings.readiness_timeout_ms))
+        self.quiet_ms = int(options.get("quiet_ms", 500))
+        self.delay_ms = int(options.get("delay_ms", 3000))
+        self.ignore = list(options.get("ignore", []))
+        self.selectors = self._required_selectors(selectors)
+
+        self._page = None
+        self._inflight: set = set()
+        self._idle = asyncio.Event()
+        self._quiet_handle: asyncio.TimerHandle | None = None
+
+    @staticmethod
+    def _required_selectors(selectors: list[dict]) -> list[str]:
+        """Selectors that must be present; defaults to the first field."""
+        required = [s["selector"] for s in selectors if s.get("required") and s.get("selector")]
+        if not required and selectors and selectors[0].get("selector"):
+            required = [selectors[0]["selector"]]
+        return required
+
+    def attach(self, page):
+        """Start tracking network activity (network_idle must see navigation)."""
+        if self.strategy != "network_idle":
+            return
+        self._page = page
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def detach(self):
+        """Remove page listeners added by attach()."""
+        if self._quiet_handle:
+            self._quiet_handle.cancel()
+        if self._page is None:
+            return
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+        ):
+            try:
+                self._page.remove_listener(event, handler)
+            except Exception:
+                pass
+        self._page = None
+
+    async def wait(self, page) -> dict[str, Any]:
+        """
+        Wait until the page is ready or the deadline budget runs out.
+
+        Returns:
+            dict with strategy, condition that ended the wait and waited_ms
+        """
+        start = time.monotonic()
+        timeout_s = self.timeout_ms / 1000
+
+        try:
+            if self.strategy == "delay":
+                await asyncio.sleep(min(self.delay_ms, self.timeout_ms) / 1000)
+                condition = "delay" if self.delay_ms <= self.timeout_ms else "deadline"
+            elif self.strategy == "mutation_quiet":
+                condition = await asyncio.wait_for(
+                    page.evaluate(
+                        MUTATION_QUIET_JS,
+                        {"quietMs": self.quiet_ms, "timeoutMs": self.timeout_ms},
+                    ),
+                    timeout=timeout_s + 1,
+                )
+            elif self.strategy == "network_idle":
+                condition = await self._wait_network_idle(timeout_s)
+            else:
+                condition = await self._wait_selectors(page, timeout_s)
+        except (TimeoutError, PlaywrightTimeoutError):
+            condition = "deadline"
+        except Exception as e:
+            logger.warning(f"Readiness wait ({self.strategy}) failed: {e}")
+            condition = "error"
+
+        waited_ms = int((time.monotonic() - start) * 1000)
+        if condition in ("deadline", "error"):
+            try:
+                logger.info(
+                    f"Page not ready after {waited_ms}ms: {await page.title()} ({page.url})"
+                )
+            except Exception:
+                pass
+        else:
+            logger.info(f"Page ready via {condition} after {waited_ms}ms")
+
+        return {"strategy": self.strategy, "condition": condition, "waited_ms": waited_ms}
+
+    async def _wait_selectors(self, page, timeout_s: float) -> str:
+        """Wait until every required selector is attached to the DOM."""
+        if not self.selectors:
+            return "selectors"
+        logger.info(f"Waiting for selectors: {self.selectors}")
+        # Playwright gets the same budget so its waits end in the browser too
+        # (cancelling wait_for doesn't stop them); its TimeoutError is a deadline
+        timeout_ms = timeout_s * 1000
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    page.wait_for_selector(s, state="attached", timeout=timeout_ms)
+                    for s in self.selectors
+                )
+            ),
+            timeout=timeout_s,
+        )
+        return "selectors"
+
+    async def _wait_network_idle(self, timeout_s: float) -> str:
+        """Wait until no tracked request has been in flight for quiet_ms."""
+        if not self._inflight:
+            self._schedule_idle()
+        await asyncio.wait_for(self._idle.wait(), timeout=timeout_s)
+        return "network_idle"
+
+    def _is_ignored(self, url: str) -> bool:
+        return any(pattern in url for pattern in self.ignore)
+
+    def _on_request(self, request):
+        if self._is_ignored(request.url):
+            return
+        self._inflight.add(request)
+        self._idle.clear()
+        if self._quiet_handle:
+            self._quiet_handle.cancel()
+            self._quiet_handle = None
+
+    def _on_request_done(self, request):
+        if request not in self._inflight:
+            return
+        self._inflight.discard(request)
+        if not self._inflight:
+            self._schedule_idle()
+
+    def _schedule_idle(self):
+        if self._quiet_handle:
+            self._quiet_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._quiet_handle = loop.call_later(self.quiet_ms / 1000, self._idle.set)
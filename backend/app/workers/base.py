@@ -1,6 +1,12 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from datetime import datetime
+from urllib.parse import urlparse
+
+from app.config import settings
+from app.core.manager import JobRecord
+from app.core.politeness import domain_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -17,24 +23,54 @@ class BaseWorker(ABC):
         """Main worker loop."""
         logger.info(f"{self.name} started")
 
-        while self.manager.is_running():
+        while True:
             try:
-                # Wait for a job with timeout to allow checking if still running
-                try:
-                    job_id = await asyncio.wait_for(
-                        self.manager.queue.get(),
-                        timeout=1.0,
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                # Blocks until a job arrives; None means the queue was closed for shutdown
+                job_id = await self.manager.queue.get()
+                if job_id is None:
+                    break
 
                 job = self.manager.get_job(job_id)
                 if not job:
                     logger.warning(f"Job {job_id} not found")
                     continue
+                if job.status != "pending":
+                    # Cancelled while queued
+                    continue
+                if job.deadline and job.deadline <= datetime.now():
+                    self.manager.cancel_job(
+                        job_id,
+                        reason="Deadline passed before the job started",
+                        error_type="deadline",
+                    )
+                    continue
 
-                logger.info(f"{self.name} processing job {job_id}")
-                await self.process(job)
+                # Saturated domain: park the job until the domain has room, take another one
+                domain = urlparse(job.url).hostname or ""
+                limits = await self.limits_for(job)
+                if job.status != "pending":
+                    # Cancelled while its limits were looked up
+                    continue
+                if domain_limiter.try_acquire(domain, limits, job_id):
+                    self.manager.park_job(job, domain)
+                    continue
+
+                # Own task per job, so cancel_job() can stop it without stopping the worker
+                task = asyncio.create_task(self._process_with_deadline(job))
+                self.manager.job_tasks[job_id] = task
+                try:
+                    logger.info(f"{self.name} processing job {job_id}")
+                    await task
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        # The worker itself is stopping: let the job unwind first
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                        raise
+                    logger.info(f"{self.name} job {job_id} cancelled")
+                finally:
+                    self.manager.job_tasks.pop(job_id, None)
+                    domain_limiter.release(domain)
 
             except asyncio.CancelledError:
                 logger.info(f"{self.name} cancelled")
@@ -44,7 +80,33 @@ class BaseWorker(ABC):
 
         logger.info(f"{self.name} stopped")
 
+    async def _process_with_deadline(self, job: JobRecord):
+        """Run process() under the job's hard deadline (watchdog)."""
+        timeout_s = await self.deadline_for(job)
+        try:
+            async with asyncio.timeout(timeout_s) as deadline:
+                await self.process(job)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            self.manager.stats["timed_out"] += 1
+            logger.error(f"{self.name} job {job.id} exceeded its {timeout_s}s deadline")
+            await self.on_timeout(job, timeout_s)
+
+    async def deadline_for(self, job: JobRecord) -> float:
+        """Hard time limit for a job, in seconds."""
+        return settings.job_timeout_seconds
+
+    async def limits_for(self, job: JobRecord) -> dict[str, float]:
+        """Politeness limits for the job's domain."""
+        return domain_limiter.limits()
+
     @abstractmethod
-    async def process(self, job: dict):
+    async def process(self, job: JobRecord):
         """Process a single job. Must be implemented by subclasses."""
         pass
+
+    @abstractmethod
+    async def on_timeout(self, job: JobRecord, timeout_s: float):
+        """Record a job killed by the watchdog. Must be implemented by subclasses."""
+        pass
@@ -0,0 +1,45 @@
+import random
+from typing import Any
+
+from app.config import settings
+
+# Failure classes retried unless the template says otherwise
+DEFAULT_RETRY_ON = ["network", "timeout", "http_status", "browser_crash"]
+
+# HTTP statuses worth retrying; other 4xx won't change on a retry
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def retry_policy(config: dict | None = None) -> dict[str, Any]:
+    """Global retry settings, overridden by a template's config.retry."""
+    policy = {
+        "max_attempts": settings.retry_max_attempts,
+        "backoff_seconds": settings.retry_backoff_seconds,
+        "max_backoff_seconds": settings.retry_max_backoff_seconds,
+        "retry_on": DEFAULT_RETRY_ON,
+    }
+    policy.update((config or {}).get("retry") or {})
+    return policy
+
+
+def should_retry(
+    policy: dict[str, Any],
+    error_type: str,
+    http_status: int | None,
+    attempts: int,
+) -> bool:
+    """Whether a job that failed on its attempts-th attempt gets another one."""
+    if attempts >= policy["max_attempts"] or error_type not in policy["retry_on"]:
+        return False
+    if error_type == "http_status":
+        return http_status in RETRYABLE_STATUSES
+    return True
+
+
+def backoff_delay(policy: dict[str, Any], attempts: int) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^(attempts-1)))."""
+    ceiling = min(
+        policy["max_backoff_seconds"],
+        policy["backoff_seconds"] * 2 ** max(attempts - 1, 0),
+    )
+    return random.uniform(0, ceiling)
@@ -1,10 +1,17 @@
 import json
 import logging
+from contextlib import aclosing
 from datetime import datetime
 
+from app.config import settings
 from app.core.database import db
+from app.core.manager import JobRecord
+from app.core.politeness import domain_limiter
+from app.core.templates import template_cache
+from app.scraping.errors import SelectorMissingError, classify
 from app.scraping.executor import executor
 from app.workers.base import BaseWorker
+from app.workers.retry import backoff_delay, retry_policy, should_retry
 
 logger = logging.getLogger(__name__)
 
@@ -12,83 +19,237 @@ logger = logging.getLogger(__name__)
 class ScraperWorker(BaseWorker):
     """Worker that executes scraping jobs."""
 
-    async def process(self, job: dict):
+    async def process(self, job: JobRecord):
         """Process a scraping job."""
-        job_id = job["id"]
+        job_id = job.id
         start_time = datetime.now()
 
         # Update job status to running
         self.manager.update_job(job_id, status="running", started_at=start_time)
 
         try:
-            # Fetch template from database
-            template = await db.fetchrow(
-                "SELECT * FROM scrape_templates WHERE id = $1",
-                job["template_id"],
-            )
+            # Fetch template (cached, batches share one lookup)
+            template = await template_cache.get(job.template_id)
 
             if not template:
-                raise ValueError(f"Template {job['template_id']} not found")
+                raise ValueError(f"Template {job.template_id} not found")
+
+            config = template["config"] or {}
+            selectors = template["selectors"] or []
+
+            # Crawl mode streams one result row per page; not retried, rows are already written
+            if config.get("crawl"):
+                try:
+                    summary = await self._crawl(job, template)
+                except Exception as e:
+                    await self._fail(job, str(e), error_type=classify(e)[0])
+                    return
+                # Every page failed: the rows are written, the job itself failed
+                all_failed = summary["pages"] > 0 and summary["failed"] == summary["pages"]
+                self.manager.update_job(
+                    job_id,
+                    status="failed" if all_failed else "success",
+                    finished_at=datetime.now(),
+                    result={"pages": summary["pages"], "failed": summary["failed"]},
+                    error=summary["error"] if all_failed else None,
+                    error_type=summary["error_type"] if all_failed else None,
+                )
+                logger.info(
+                    f"Job {job_id} crawled {summary['pages']} pages ({summary['failed']} failed)"
+                )
+                return
 
             # Execute scraping
             result = await executor.execute(
-                url=job["url"],
-                selectors=template["selectors"] or [],
+                url=job.url,
+                selectors=selectors,
+                config=config,
+                template_id=template["id"],
+                url_pattern=template["url_pattern"],
             )
 
+            missing = [
+                s["name"]
+                for s in selectors
+                if s.get("required") and result["data"].get(s["name"]) in (None, "", [])
+            ]
+            if missing:
+                raise SelectorMissingError(missing)
+
             # Calculate duration
             end_time = datetime.now()
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
 
             # Save result to database
-            await db.execute(
-                """
-                INSERT INTO scrape_results (template_id, schedule_id, url, status, data, duration_ms)
-                VALUES ($1, $2, $3, $4, $5::jsonb, $6)
-                """,
-                job["template_id"],
-                job.get("schedule_id"),
-                job["url"],
-                "success",
-                json.dumps(result["data"]),
-                duration_ms,
+            result_id = await self._save_result(
+                job, job.url, data=result["data"], duration_ms=duration_ms
             )
 
-            # Update job status
+            # Update job status; the payload lives in scrape_results, keep only a summary
             self.manager.update_job(
                 job_id,
                 status="success",
                 finished_at=end_time,
-                result=result["data"],
+                result={"result_id": result_id, "fields": len(result["data"])},
+                readiness=result.get("readiness"),
+                error=None,
+                error_type=None,
             )
 
             logger.info(f"Job {job_id} completed successfully in {duration_ms}ms")
 
         except Exception as e:
-            end_time = datetime.now()
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
-            error_msg = str(e)
-
-            # Save error result to database
-            await db.execute(
+            error_type, http_status = classify(e)
+            await self._retry_or_fail(job, str(e), error_type, http_status)
+
+    async def deadline_for(self, job: JobRecord) -> float:
+        """Per-template deadline from config.job_timeout_seconds."""
+        template = await template_cache.get(job.template_id)
+        config = (template["config"] or {}) if template else {}
+        return float(config.get("job_timeout_seconds", settings.job_timeout_seconds))
+
+    async def limits_for(self, job: JobRecord) -> dict[str, float]:
+        """Global politeness limits, overridden by the template's config.politeness."""
+        template = await template_cache.get(job.template_id)
+        return domain_limiter.limits(template["config"] if template else None)
+
+    async def on_timeout(self, job: JobRecord, timeout_s: float):
+        """Retry or fail a job whose page was killed by the watchdog."""
+        error_msg = f"Job exceeded its {timeout_s:g}s deadline"
+        template = await template_cache.get(job.template_id)
+        if template and (template["config"] or {}).get("crawl"):
+            # Like any crawl failure: the pages crawled so far are written, don't retry
+            await self._fail(job, error_msg, error_type="timeout")
+            return
+        await self._retry_or_fail(job, error_msg, "timeout")
+
+    async def _retry_or_fail(
+        self,
+        job: JobRecord,
+        error_msg: str,
+        error_type: str,
+        http_status: int | None = None,
+    ):
+        """Requeue the job with backoff if the template's retry policy allows it, else fail it."""
+        template = await template_cache.get(job.template_id)
+        policy = retry_policy(template["config"] if template else None)
+
+        if not should_retry(policy, error_type, http_status, job.attempts):
+            await self._fail(job, error_msg, error_type=error_type)
+            return
+
+        delay = backoff_delay(policy, job.attempts)
+        logger.warning(
+            f"Job {job.id} attempt {job.attempts} failed ({error_type}: {error_msg}), "
+            f"retrying in {delay:.1f}s"
+        )
+        self.manager.stats["retried"] += 1
+        self.manager.update_job(job.id, error=error_msg, error_type=error_type)
+        await self.manager.requeue_job(job.id, delay=delay)
+
+    async def _fail(self, job: JobRecord, error_msg: str, error_type: str | None = None):
+        """Record a failed job."""
+        job_id = job.id
+        end_time = datetime.now()
+        start_time = job.started_at or end_time
+        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+
+        # Save error result to database
+        await self._save_result(
+            job, job.url, error=error_msg, error_type=error_type, duration_ms=duration_ms
+        )
+
+        # Update job status
+        self.manager.update_job(
+            job_id,
+            status="failed",
+            finished_at=end_time,
+            error=error_msg,
+            error_type=error_type,
+        )
+
+        logger.error(f"Job {job_id} failed: {error_msg}")
+
+    async def _crawl(self, job: JobRecord, template) -> dict:
+        """
+        Run a crawl, writing each page's result as soon as it completes.
+
+        Returns:
+            dict with pages, failed and the last page error (error, error_type)
+        """
+        pages = 0
+        failed = 0
+        last_error = last_error_type = None
+
+        # aclosing: if saving a page raises, the crawl's pooled page is released now
+        crawl = executor.crawl(
+            url=job.url,
+            selectors=template["selectors"] or [],
+            config=template["config"] or {},
+        )
+        async with aclosing(crawl) as crawled:
+            async for page in crawled:
+                pages += 1
+                if page["error"]:
+                    failed += 1
+                    last_error, last_error_type = page["error"], page["error_type"]
+                await self._save_result(
+                    job,
+                    page["url"],
+                    data=page["data"],
+                    error=page["error"],
+                    error_type=page["error_type"],
+                    duration_ms=page["duration_ms"],
+                )
+                self.manager.update_job(job.id, result={"pages": pages, "failed": failed})
+
+        return {
+            "pages": pages,
+            "failed": failed,
+            "error": last_error,
+            "error_type": last_error_type,
+        }
+
+    async def _save_result(
+        self,
+        job: JobRecord,
+        url: str,
+        data: dict | None = None,
+        error: str | None = None,
+        error_type: str | None = None,
+        duration_ms: int | None = None,
+    ) -> int:
+        """Insert a scrape_results row; failed when an error is given. Returns its ID."""
+        if error is not None:
+            return await db.fetchval(
                 """
-                INSERT INTO scrape_results (template_id, schedule_id, url, status, error, duration_ms)
-                VALUES ($1, $2, $3, $4, $5, $6)
+                INSERT INTO scrape_results
+                    (template_id, schedule_id, url, status, error, error_type, duration_ms, attempt)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                RETURNING id
                 """,
-                job["template_id"],
-                job.get("schedule_id"),
-                job["url"],
+                job.template_id,
+                job.schedule_id,
+                url,
                 "failed",
-                error_msg,
+                error,
+                error_type,
                 duration_ms,
+                job.attempts,
             )
-
-            # Update job status
-            self.manager.update_job(
-                job_id,
-                status="failed",
-                finished_at=end_time,
-                error=error_msg,
+        else:
+            return await db.fetchval(
+                """
+                INSERT INTO scrape_results
+                    (template_id, schedule_id, url, status, data, duration_ms, attempt)
+                VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7)
+                RETURNING id
+                """,
+                job.template_id,
+                job.schedule_id,
+                url,
+                "success",
+                json.dumps(data),
+                duration_ms,
+                job.attempts,
             )
-
-            logger.error(f"Job {job_id} failed: {error_msg}")
@@ -0,0 +1,375 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from datetime import datetime
+from typing import Any
+
+from app.config import settings
+from app.core.manager import JobRecord
+from app.core.templates import template_cache
+from app.workers.retry import retry_policy, should_retry
+from app.workers.scraper import ScraperWorker
+
+logger = logging.getLogger(__name__)
+
+# Extra time the supervisor gives a worker process beyond the job's own deadline,
+# which the process enforces itself
+PROCESS_DEADLINE_SLACK = 30.0
+
+# Respawns of a crashed worker process wait this long, doubling up to the max
+RESPAWN_BACKOFF_SECONDS = 1.0
+RESPAWN_BACKOFF_MAX_SECONDS = 60.0
+
+
+class _RemoteStats(dict):
+    """Counter dict whose increments are forwarded to the supervisor."""
+
+    def __init__(self, send):
+        super().__init__()
+        self._send = send
+
+    def __missing__(self, key):
+        return 0
+
+    def __setitem__(self, key, value):
+        self._send(("stat", key, value - self[key]))
+        super().__setitem__(key, value)
+
+
+class RemoteManager:
+    """
+    Stands in for WorkerManager inside a worker process, forwarding job
+    state to the supervisor.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.jobs: dict[str, JobRecord] = {}
+        self.stats = _RemoteStats(self._send)
+
+    def _send(self, message: tuple):
+        self._conn.send(message)
+
+    def get_job(self, job_id: str) -> JobRecord | None:
+        return self.jobs.get(job_id)
+
+    def update_job(self, job_id: str, **kwargs):
+        job = self.jobs.get(job_id)
+        if job:
+            for key, value in kwargs.items():
+                setattr(job, key, value)
+        self._send(("update", job_id, kwargs))
+
+    async def requeue_job(self, job_id: str, delay: float = 0.0):
+        self._send(("requeue", job_id, delay))
+
+
+def worker_process_main(index: int, conn):
+    """Entry point of a worker process: its own event loop, database pool and browser pool."""
+    # Ctrl-C reaches the whole process group: leave shutdown to the supervisor's
+    # "stop", so in-flight jobs drain instead of dying with KeyboardInterrupt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format=f"%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(_serve(index, conn))
+
+
+async def _serve(index: int, conn):
+    from app.core.database import db
+    from app.scraping.browser import browser_pool
+    from app.scraping.http_engine import http_executor
+
+    manager = RemoteManager(conn)
+    worker = ScraperWorker(manager, index)
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run(job: JobRecord):
+        try:
+            await worker._process_with_deadline(job)
+        except asyncio.CancelledError:
+            logger.info(f"Job {job.id} cancelled by the supervisor")
+        except Exception as e:
+            logger.error(f"Job {job.id} error: {e}")
+        finally:
+            tasks.pop(job.id, None)
+            manager.jobs.pop(job.id, None)
+            try:
+                manager._send(("done", job.id))
+            except OSError:
+                pass
+
+    startup = [db.connect()]
+    if not settings.browser_lazy_start:
+        startup.append(browser_pool.start())
+    await asyncio.gather(*startup)
+    logger.info(f"Worker process {index} ready")
+
+    try:
+        while True:
+            try:
+                message = await asyncio.to_thread(conn.recv)
+            except (EOFError, OSError):
+                logger.warning("Supervisor went away, exiting")
+                break
+
+            kind = message[0]
+            if kind == "job":
+                job = message[1]
+                manager.jobs[job.id] = job
+                tasks[job.id] = asyncio.create_task(run(job))
+            elif kind == "cancel":
+                task = tasks.get(message[1])
+                if task:
+                    task.cancel()
+            elif kind == "stop":
+                break
+
+        # Let in-flight jobs finish before exiting
+        if tasks:
+            logger.info(f"Draining {len(tasks)} jobs")
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        await browser_pool.stop()
+        await http_executor.stop()
+        await db.disconnect()
+
+
+class WorkerProcess:
+    """A worker process as seen by the supervisor."""
+
+    __slots__ = ("index", "process", "conn", "inflight")
+
+    def __init__(self, index: int, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.inflight: dict[str, asyncio.Future] = {}
+
+
+class ProcessSupervisor:
+    """
+    Runs jobs in worker processes, each with its own event loop and BrowserPool.
+
+    Dispatch stays in the API process: ProcessWorker coroutines take jobs
+    from the manager's queue (priorities, fairness and politeness apply
+    across all processes) and hand them to a process over a pipe. Processes
+    report job state back and the supervisor applies it to the manager.
+    Crashed processes are respawned and their in-flight jobs requeued.
+    """
+
+    def __init__(self, manager, processes: int):
+        self.manager = manager
+        self.children: list[WorkerProcess | None] = [None] * processes
+        self._ctx = multiprocessing.get_context("spawn")
+        self._monitor: asyncio.Task | None = None
+        self._backoff = [RESPAWN_BACKOFF_SECONDS] * processes
+        self._stopping = False
+        self._tasks: set[asyncio.Task] = set()
+        self._respawns: dict[int, asyncio.TimerHandle] = {}  # index -> pending respawn
+
+    async def start(self):
+        for index in range(len(self.children)):
+            self._spawn(index)
+        self._monitor = asyncio.create_task(self._monitor_loop())
+        logger.info(f"Started {len(self.children)} worker processes")
+
+    async def stop(self):
+        """
+        Ask every process to drain its jobs, then wait for them to exit.
+
+        WorkerManager.stop_workers() runs this alongside its own wait on the
+        dispatching workers, so both share one grace period.
+        """
+        self._stopping = True
+        if self._monitor:
+            self._monitor.cancel()
+        for handle in self._respawns.values():
+            handle.cancel()
+        self._respawns.clear()
+
+        for child in self.children:
+            if child and child.process.is_alive():
+                try:
+                    child.conn.send(("stop",))
+                except OSError:
+                    pass
+
+        # One grace period for all of them, not one each
+        deadline = time.monotonic() + settings.shutdown_grace_seconds
+        for child in self.children:
+            if not child:
+                continue
+            remaining = max(0.0, deadline - time.monotonic())
+            await asyncio.to_thread(child.process.join, remaining)
+            if child.process.is_alive():
+                logger.warning(f"Worker process {child.index} didn't exit, terminating")
+                child.process.terminate()
+            self._unwatch(child)
+
+        logger.info("Worker processes stopped")
+
+    def _spawn(self, index: int):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=worker_process_main,
+            args=(index, child_conn),
+            name=f"scraper-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        child = WorkerProcess(index, process, parent_conn)
+        self._watch(child)
+        self.children[index] = child
+
+    async def run_job(self, index: int, job: JobRecord):
+        """Run a job on a worker process and wait until it reports it done."""
+        child = self.children[index]
+        if child is None or not child.process.is_alive():
+            # Being respawned: let another process take the job
+            self.manager.defer_job(job, RESPAWN_BACKOFF_SECONDS)
+            await asyncio.sleep(RESPAWN_BACKOFF_SECONDS)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        child.inflight[job.id] = future
+        try:
+            child.conn.send(("job", job))
+        except OSError:
+            child.inflight.pop(job.id, None)
+            self.manager.defer_job(job, RESPAWN_BACKOFF_SECONDS)
+            return
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            child.inflight.pop(job.id, None)
+            if child.process.is_alive():
+                child.conn.send(("cancel", job.id))
+            raise
+
+    def _watch(self, child: WorkerProcess):
+        # Reading on the event loop instead of a thread per pipe: with dozens of
+        # processes, blocking readers would exhaust the default executor
+        asyncio.get_running_loop().add_reader(child.conn.fileno(), self._on_readable, child)
+
+    def _unwatch(self, child: WorkerProcess):
+        if not child.conn.closed:
+            # What an exited process reported last may still sit in the pipe
+            self._read(child)
+            asyncio.get_running_loop().remove_reader(child.conn.fileno())
+            child.conn.close()
+
+    def _on_readable(self, child: WorkerProcess):
+        if not self._read(child):
+            self._unwatch(child)
+
+    def _read(self, child: WorkerProcess) -> bool:
+        """Apply the job state a process reports. False once its end of the pipe is closed."""
+        try:
+            while child.conn.poll():
+                message = child.conn.recv()
+                try:
+                    self._handle(child, message)
+                except Exception as e:
+                    logger.error(f"Worker process {child.index} message {message[0]} failed: {e}")
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _handle(self, child: WorkerProcess, message: tuple[Any, ...]):
+        kind = message[0]
+        if kind in ("update", "requeue"):
+            job = self.manager.get_job(message[1])
+            if job and job.status == "cancelled":
+                # Sent before the process saw the cancel
+                return
+
+        if kind == "update":
+            _, job_id, fields = message
+            self.manager.update_job(job_id, **fields)
+        elif kind == "requeue":
+            _, job_id, delay = message
+            task = asyncio.create_task(self.manager.requeue_job(job_id, delay=delay))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif kind == "stat":
+            _, key, delta = message
+            self.manager.stats[key] = self.manager.stats.get(key, 0) + delta
+        elif kind == "done":
+            self._backoff[child.index] = RESPAWN_BACKOFF_SECONDS
+            future = child.inflight.pop(message[1], None)
+            if future and not future.done():
+                future.set_result(None)
+
+    async def _monitor_loop(self):
+        """Requeue the jobs of crashed processes right away and schedule their respawn."""
+        loop = asyncio.get_running_loop()
+        while not self._stopping:
+            await asyncio.sleep(1)
+            for index, child in enumerate(self.children):
+                if child.process.is_alive() or index in self._respawns or self._stopping:
+                    continue
+
+                logger.error(
+                    f"Worker process {index} died (exit code {child.process.exitcode}), "
+                    f"respawning in {self._backoff[index]:.0f}s"
+                )
+                self.manager.stats["respawns"] = self.manager.stats.get("respawns", 0) + 1
+                self._unwatch(child)
+                await self._recover_jobs(child)
+
+                # Each child backs off on its own, a crash-looping one doesn't hold up the rest
+                self._respawns[index] = loop.call_later(self._backoff[index], self._respawn, index)
+                self._backoff[index] = min(self._backoff[index] * 2, RESPAWN_BACKOFF_MAX_SECONDS)
+
+    def _respawn(self, index: int):
+        self._respawns.pop(index, None)
+        if not self._stopping:
+            self._spawn(index)
+
+    async def _recover_jobs(self, child: WorkerProcess):
+        for job_id, future in list(child.inflight.items()):
+            job = self.manager.get_job(job_id)
+            if job and job.status in ("pending", "running"):
+                try:
+                    template = await template_cache.get(job.template_id)
+                except Exception as e:
+                    logger.error(f"Failed to load template {job.template_id}: {e}")
+                    template = None
+                # Same policy as a crash seen in-process (ScraperWorker._retry_or_fail)
+                policy = retry_policy(template["config"] if template else None)
+                if should_retry(policy, "browser_crash", None, job.attempts):
+                    await self.manager.requeue_job(job_id)
+                else:
+                    self.manager.update_job(
+                        job_id,
+                        status="failed",
+                        finished_at=datetime.now(),
+                        error="Worker process crashed",
+                        error_type="browser_crash",
+                    )
+            if not future.done():
+                future.set_result(None)
+        child.inflight.clear()
+
+
+class ProcessWorker(ScraperWorker):
+    """Dispatches jobs to one worker process instead of scraping in this process."""
+
+    def __init__(self, manager, worker_id: int, supervisor: ProcessSupervisor, process_index: int):
+        super().__init__(manager, worker_id)
+        self.supervisor = supervisor
+        self.process_index = process_index
+
+    async def process(self, job: JobRecord):
+        await self.supervisor.run_job(self.process_index, job)
+
+    async def deadline_for(self, job: JobRecord) -> float:
+        """Backstop only: the process enforces the job's own deadline."""
+        return await super().deadline_for(job) + PROCESS_DEADLINE_SLACK
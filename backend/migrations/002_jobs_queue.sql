@@ -0,0 +1,27 @@
+-- Migrations are created automatically by the application
+-- This file is for reference only
+
+-- Fila de jobs (QUEUE_BACKEND=postgres)
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id UUID PRIMARY KEY,
+    template_id INT NOT NULL,
+    schedule_id INT,
+    batch_id UUID,
+    url TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending, running, success, failed, cancelled
+    priority SMALLINT NOT NULL DEFAULT 0,  -- 0 interactive, 1 scheduled, 2 backfill
+    deadline TIMESTAMP,                 -- dropped unstarted after this
+    attempts INT NOT NULL DEFAULT 0,
+    lease_owner TEXT,                   -- worker node holding the job
+    lease_expires_at TIMESTAMP,         -- renewed by heartbeats, reclaimed when expired
+    run_after TIMESTAMP,                -- deferred jobs aren't claimed before this
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Índices
+CREATE INDEX IF NOT EXISTS idx_jobs_pending ON scrape_jobs(priority, created_at) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON scrape_jobs(lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON scrape_jobs(batch_id);
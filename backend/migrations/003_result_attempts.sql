@@ -0,0 +1,6 @@
+-- Migrations are created automatically by the application
+-- This file is for reference only
+
+-- Tentativas e classificação de falhas nos resultados
+ALTER TABLE scrape_results ADD COLUMN IF NOT EXISTS attempt INT DEFAULT 1;
+ALTER TABLE scrape_results ADD COLUMN IF NOT EXISTS error_type VARCHAR(30);  -- network, timeout, http_status, selector_missing, browser_crash, other
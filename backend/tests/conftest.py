@@ -0,0 +1,22 @@
+import pytest
+
+from app.config import settings
+from app.core.templates import template_cache
+
+
+@pytest.fixture(autouse=True)
+def memory_queue(monkeypatch):
+    """Run against the in-process queue."""
+    monkeypatch.setattr(settings, "queue_backend", "memory")
+
+
+@pytest.fixture
+def templates(monkeypatch):
+    """Template configs by id, served in place of the database-backed cache."""
+    configs: dict[int, dict] = {}
+
+    async def get(template_id: int):
+        return {"id": template_id, "config": configs.get(template_id, {})}
+
+    monkeypatch.setattr(template_cache, "get", get)
+    return configs
@@ -0,0 +1,76 @@
+import asyncio
+
+from app.core.manager import WorkerManager
+
+
+def _manager_with_jobs(count: int) -> WorkerManager:
+    async def scenario():
+        manager = WorkerManager()
+        await manager.create_batch(1, [f"https://a.test/{i}" for i in range(count)])
+        return manager
+
+    return asyncio.run(scenario())
+
+
+def _pages(manager: WorkerManager, limit: int, **filters) -> list[list[int]]:
+    pages, cursor = [], None
+    while True:
+        page = manager.list_jobs(limit=limit, cursor=cursor, **filters)
+        if not page:
+            return pages
+        pages.append([job.seq for job in page])
+        cursor = page[-1].seq
+
+
+def test_pages_newest_first(templates):
+    manager = _manager_with_jobs(7)
+    assert _pages(manager, 3) == [[7, 6, 5], [4, 3, 2], [1]]
+
+
+def test_status_filter_follows_seq_not_transition_order(templates):
+    manager = _manager_with_jobs(6)
+    jobs = manager.list_jobs()
+    for job in reversed(jobs):  # oldest first, so the bucket's order is reversed
+        if job.seq % 2:
+            manager.update_job(job.id, status="success")
+    assert _pages(manager, 2, status="success") == [[5, 3], [1]]
+    assert _pages(manager, 2, status="pending") == [[6, 4], [2]]
+
+
+def test_evicted_jobs_are_skipped(templates):
+    manager = _manager_with_jobs(5)
+    for job in manager.list_jobs():
+        if job.seq in (2, 4):
+            manager.update_job(job.id, status="success")
+    assert manager.cleanup_old_jobs(max_age_seconds=3600, max_jobs=0) == 2
+    assert _pages(manager, 2) == [[5, 3], [1]]
+    assert [job.seq for job in manager.list_jobs(cursor=3)] == [1]
+
+
+def test_shutdown_only_requeues_jobs_running_here(templates):
+    async def scenario():
+        manager = WorkerManager()
+        await manager.queue.start()
+        job = await manager.create_job(1, "https://a.test/")
+        await manager.queue.get()
+        # Running on another node, only mirrored here
+        manager.update_job(job.id, status="running")
+        return job, await manager.stop_workers(grace_seconds=0)
+
+    job, report = asyncio.run(scenario())
+    assert report == {"drained": 0, "abandoned": 0}
+    assert job.status == "running"
+
+
+def test_late_updates_dont_revive_a_cancelled_job(templates):
+    async def scenario():
+        manager = WorkerManager()
+        job = await manager.create_job(1, "https://a.test/")
+        assert manager.cancel_job(job.id)
+        manager.update_job(job.id, status="running")
+        return manager, job
+
+    manager, job = asyncio.run(scenario())
+    assert job.status == "cancelled"
+    assert manager.running_count == 0
+    assert not manager.cancel_job(job.id)
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+from app.core.manager import WorkerManager
+from app.core.politeness import DomainLimiter, domain_limiter
+from app.workers.base import BaseWorker
+
+LIMITS = {"rate_per_second": 0, "burst": 1, "max_concurrency": 2}
+
+
+def test_concurrency_cap_and_release():
+    limiter = DomainLimiter()
+    assert limiter.try_acquire("a.test", LIMITS) == 0
+    assert limiter.try_acquire("a.test", LIMITS) == 0
+    assert limiter.try_acquire("a.test", LIMITS) > 0
+    # Other domains have their own slots
+    assert limiter.try_acquire("b.test", LIMITS) == 0
+
+    limiter.release("a.test")
+    assert limiter.snapshot() == {"a.test": 1, "b.test": 1}
+    assert limiter.try_acquire("a.test", LIMITS) == 0
+
+
+def test_token_bucket_refills():
+    limiter = DomainLimiter()
+    limits = {"rate_per_second": 10, "burst": 2, "max_concurrency": 0}
+    assert limiter.try_acquire("a.test", limits) == 0
+    assert limiter.try_acquire("a.test", limits) == 0
+    delay = limiter.try_acquire("a.test", limits)
+    assert 0 < delay <= 0.1
+
+    time.sleep(delay + 0.01)
+    assert limiter.try_acquire("a.test", limits) == 0
+
+
+def test_release_resumes_a_parked_job():
+    async def scenario():
+        limiter = DomainLimiter()
+        resumed = []
+        limits = dict(LIMITS, max_concurrency=1)
+        assert limiter.try_acquire("a.test", limits) == 0
+        for key in ("one", "two"):
+            assert limiter.try_acquire("a.test", limits, key) > 0
+            limiter.park("a.test", key, lambda key=key: resumed.append(key))
+        await asyncio.sleep(0.05)
+        assert not resumed
+
+        limiter.release("a.test")
+        await asyncio.sleep(0.01)
+        assert resumed == ["one"]
+        # The freed slot is reserved for "one" until it comes back for it
+        assert limiter.try_acquire("a.test", limits, "one") == 0
+        limiter.release("a.test")
+        await asyncio.sleep(0.01)
+        assert resumed == ["one", "two"]
+        assert limiter.parked() == 0
+
+    asyncio.run(scenario())
+
+
+def test_rate_limited_resume_fires_on_time():
+    async def scenario():
+        limiter = DomainLimiter()
+        resumed = []
+        limits = {"rate_per_second": 5, "burst": 1, "max_concurrency": 0}
+        assert limiter.try_acquire("a.test", limits) == 0
+        start = time.monotonic()
+        for key in ("one", "two"):
+            delay = limiter.try_acquire("a.test", limits, key)
+            limiter.park("a.test", key, lambda: resumed.append(time.monotonic() - start))
+        assert 0 < delay <= 0.2
+        await asyncio.sleep(0.25)
+        assert limiter.try_acquire("a.test", limits, "one") == 0
+        await asyncio.sleep(0.2)
+        return resumed
+
+    resumed = asyncio.run(scenario())
+    assert len(resumed) == 2
+    assert abs(resumed[0] - 0.2) < 0.05
+    assert abs(resumed[1] - 0.4) < 0.05
+
+
+class SleepWorker(BaseWorker):
+    async def process(self, job):
+        self.manager.update_job(job.id, status="running")
+        await asyncio.sleep(0.2)
+        self.manager.update_job(job.id, status="success")
+
+    async def on_timeout(self, job, timeout_s):
+        pass
+
+    async def limits_for(self, job):
+        return LIMITS
+
+
+def test_throughput_at_the_concurrency_cap(templates):
+    async def scenario():
+        manager = WorkerManager()
+        await manager.queue.start()
+        await manager.create_batch(1, [f"https://a.test/{i}" for i in range(12)])
+        start = time.monotonic()
+        workers = [asyncio.create_task(SleepWorker(manager, i).run()) for i in range(4)]
+        while manager.stats["success"] < 12:
+            await asyncio.sleep(0.01)
+            assert time.monotonic() - start < 3
+        elapsed = time.monotonic() - start
+
+        manager.queue.close()
+        await asyncio.gather(*workers)
+        await manager.queue.stop()
+        return elapsed
+
+    try:
+        elapsed = asyncio.run(scenario())
+    finally:
+        domain_limiter.drop_parked()
+    # 12 jobs of 0.2s, two at a time
+    assert 1.2 <= elapsed < 1.5
@@ -0,0 +1,122 @@
+import asyncio
+
+from app.config import settings
+from app.core.manager import WorkerManager
+
+
+async def _drain(manager: WorkerManager) -> list:
+    """Dequeue everything queued, in order, skipping cancelled jobs like a worker does."""
+    order = []
+    while manager.queue.qsize():
+        job = manager.get_job(await manager.queue.get())
+        if job.status != "cancelled":
+            order.append(job)
+    return order
+
+
+def test_interactive_jobs_go_first(templates):
+    async def scenario():
+        manager = WorkerManager()
+        await manager.create_batch(1, [f"https://a.test/{i}" for i in range(3)])
+        await manager.create_job(1, "https://a.test/s", priority="scheduled")
+        await manager.create_job(1, "https://a.test/i")
+        return [job.priority for job in await _drain(manager)]
+
+    assert asyncio.run(scenario()) == ["interactive", "scheduled"] + ["backfill"] * 3
+
+
+def test_flows_share_the_queue_fairly(templates):
+    async def scenario():
+        manager = WorkerManager()
+        # A big batch first, then a small one for another template and another domain
+        await manager.create_batch(1, [f"https://a.test/{i}" for i in range(10)])
+        await manager.create_batch(2, [f"https://a.test/{i}" for i in range(3)])
+        await manager.create_batch(1, [f"https://b.test/{i}" for i in range(3)])
+        return await _drain(manager)
+
+    order = asyncio.run(scenario())
+    flows = [(job.template_id, job.url.split("/")[2]) for job in order[:9]]
+    # The first nine dequeues alternate between the three flows
+    for flow in [(1, "a.test"), (2, "a.test"), (1, "b.test")]:
+        assert flows.count(flow) == 3
+
+
+def test_weight_scales_a_flows_share(templates):
+    templates[2] = {"weight": 2}
+
+    async def scenario():
+        manager = WorkerManager()
+        await manager.create_batch(1, [f"https://a.test/{i}" for i in range(10)])
+        await manager.create_batch(2, [f"https://b.test/{i}" for i in range(10)])
+        return await _drain(manager)
+
+    order = asyncio.run(scenario())
+    assert [job.template_id for job in order[:6]].count(2) == 4
+
+
+def test_duplicate_requests_are_coalesced(templates, monkeypatch):
+    monkeypatch.setattr(settings, "coalesce_window_seconds", 30)
+
+    async def scenario():
+        manager = WorkerManager()
+        first = await manager.create_job(1, "https://a.test/")
+        second = await manager.create_job(1, "https://a.test/")
+        other = await manager.create_job(2, "https://a.test/")
+        return manager, first, second, other
+
+    manager, first, second, other = asyncio.run(scenario())
+    assert second is first
+    assert other is not first
+    assert first.coalesced == 1
+    assert manager.stats["coalesced"] == 1
+    assert manager.queue.qsize() == 2
+
+
+def test_coalescing_keeps_an_urgent_request_out_of_a_backfill_job(templates, monkeypatch):
+    monkeypatch.setattr(settings, "coalesce_window_seconds", 30)
+
+    async def scenario():
+        manager = WorkerManager()
+        queued = await manager.create_job(1, "https://a.test/", priority="backfill")
+        urgent = await manager.create_job(1, "https://a.test/")
+        return queued, urgent
+
+    queued, urgent = asyncio.run(scenario())
+    assert urgent is not queued
+
+
+def test_cancelled_batch_is_skipped(templates):
+    async def scenario():
+        manager = WorkerManager()
+        batch = await manager.create_batch(1, [f"https://a.test/{i}" for i in range(5)])
+        await manager.create_job(2, "https://b.test/")
+        cancelled = manager.cancel_batch(batch["id"])
+        return manager, batch, cancelled, manager.queue.qsize(), await _drain(manager)
+
+    manager, batch, cancelled, qsize, order = asyncio.run(scenario())
+    assert cancelled == 5
+    assert qsize == 1
+    assert [job.template_id for job in order] == [2]
+    assert batch["counts"]["cancelled"] == 5
+    assert manager.cancel_batch(batch["id"]) == 0
+
+
+def test_wait_is_measured_from_the_last_enqueue(templates):
+    async def scenario():
+        manager = WorkerManager()
+        job = await manager.create_job(1, "https://a.test/")
+        await asyncio.sleep(0.2)
+        await manager.queue.get()
+        manager.update_job(job.id, status="running")
+        # Retried: the time spent running and the first wait don't count again
+        await asyncio.sleep(0.1)
+        manager.update_job(job.id, status="pending")
+        manager.queue.requeue(job)
+        await asyncio.sleep(0)
+        await manager.queue.get()
+        return manager.queue.wait_stats()["interactive"]
+
+    stats = asyncio.run(scenario())
+    assert stats["count"] == 2
+    assert stats["max_ms"] >= 200
+    assert stats["avg_ms"] * 2 < stats["max_ms"] + 50
@@ -0,0 +1,59 @@
+import httpx
+import pytest
+
+from app.scraping.browser import BrowserCrashedError
+from app.scraping.errors import HttpStatusError, SelectorMissingError, classify
+from app.workers.retry import backoff_delay, retry_policy, should_retry
+
+POLICY = {
+    "max_attempts": 3,
+    "backoff_seconds": 1.0,
+    "max_backoff_seconds": 5.0,
+    "retry_on": ["network", "timeout", "http_status", "browser_crash"],
+}
+
+
+def test_template_overrides_the_global_policy():
+    policy = retry_policy({"retry": {"max_attempts": 7, "retry_on": ["timeout"]}})
+    assert policy["max_attempts"] == 7
+    assert policy["retry_on"] == ["timeout"]
+    assert "backoff_seconds" in policy
+
+
+@pytest.mark.parametrize(
+    ("error_type", "http_status", "attempts", "expected"),
+    [
+        ("timeout", None, 1, True),
+        ("timeout", None, 3, False),
+        ("network", None, 2, True),
+        ("http_status", 503, 1, True),
+        ("http_status", 429, 1, True),
+        ("http_status", 404, 1, False),
+        ("selector_missing", None, 1, False),
+        ("other", None, 1, False),
+    ],
+)
+def test_should_retry(error_type, http_status, attempts, expected):
+    assert should_retry(POLICY, error_type, http_status, attempts) is expected
+
+
+def test_backoff_is_jittered_under_an_exponential_cap():
+    for attempts, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)]:
+        delays = [backoff_delay(POLICY, attempts) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (HttpStatusError(502, "https://a.test/"), ("http_status", 502)),
+        (SelectorMissingError(["price"]), ("selector_missing", None)),
+        (BrowserCrashedError("gone"), ("browser_crash", None)),
+        (TimeoutError(), ("timeout", None)),
+        (httpx.ConnectError("refused"), ("network", None)),
+        (ValueError("bad config"), ("other", None)),
+    ],
+)
+def test_classify(exc, expected):
+    assert classify(exc) == expected
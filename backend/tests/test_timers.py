@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from app.core.timers import TimerWheel
+
+
+def _fire_times(wheel: TimerWheel, delays: list[float], wait: float) -> dict[float, float]:
+    async def scenario():
+        fired = {}
+        wheel.start()
+        start = time.monotonic()
+        for delay in delays:
+            wheel.schedule(delay, lambda delay=delay: fired.setdefault(delay, time.monotonic()))
+        await asyncio.sleep(wait)
+        wheel.stop()
+        return {delay: at - start for delay, at in fired.items()}
+
+    return asyncio.run(scenario())
+
+
+def test_timers_fire_within_a_tick():
+    wheel = TimerWheel(tick_seconds=0.05)
+    fired = _fire_times(wheel, [0.1, 0.32, 0.0], wait=0.5)
+    assert sorted(fired) == [0.0, 0.1, 0.32]
+    for delay, at in fired.items():
+        assert delay <= at < delay + 0.05 + 0.03
+    assert len(wheel) == 0
+
+
+def test_delays_beyond_one_revolution():
+    wheel = TimerWheel(tick_seconds=0.02, slots=8)  # 0.16s per revolution
+    fired = _fire_times(wheel, [0.05, 0.4], wait=0.5)
+    assert 0.4 <= fired[0.4] < 0.45
+    assert 0.05 <= fired[0.05] < 0.1
+
+
+def test_scheduling_after_idle_fires_on_time():
+    async def scenario():
+        wheel = TimerWheel(tick_seconds=0.05)
+        wheel.start()
+        await asyncio.sleep(0.3)  # Idle, parked until something is scheduled
+        fired = asyncio.get_running_loop().create_future()
+        start = time.monotonic()
+        wheel.schedule(0.1, lambda: fired.set_result(time.monotonic() - start))
+        elapsed = await asyncio.wait_for(fired, 1)
+        wheel.stop()
+        return elapsed
+
+    assert 0.1 <= asyncio.run(scenario()) < 0.18